@@ -0,0 +1,173 @@
+"""/ask 부하 적응형 처리(Admission Control) 모듈.
+
+동시 처리 수와 노드별 지연 시간 추정치로 요청마다 부하 단계를 정한다. 노드는
+state["degrade_level"]로 전달된 단계에 따라 비싼 처리를 생략한다 (src.nodes).
+"""
+
+import math
+import threading
+import time
+from typing import Callable
+
+# 부하 단계
+DEGRADE_NONE = 0  # 전체 파이프라인
+DEGRADE_SKIP_RERANK = 1  # LLM 재순위화 생략, 거리순 사용
+DEGRADE_SHORT_CONTEXT = 2  # 생성 컨텍스트 축소
+DEGRADE_RETRIEVAL_ONLY = 3  # 답변 생성 생략, 검색 결과만 반환
+
+DEGRADE_LEVEL_NAMES = ["full", "no_rerank", "short_context", "retrieval_only"]
+
+
+class AdmissionController:
+    """/ask 요청의 동시 처리 수와 최근 지연 시간에 따라 부하 단계를 결정한다.
+
+    동시 처리 수가 thresholds의 각 값에 도달할 때마다 한 단계씩 낮춘다
+    (재순위화 생략 -> 컨텍스트 축소 -> 검색 결과만 반환). 처리 중인 요청이 있으면
+    노드별 지연 시간 EWMA로 해당 단계에서 실행될 노드들의 예상 응답 시간을 합산하고,
+    latency_target을 넘으면 넘지 않는 단계까지 더 낮춘다. max_in_flight 이상이면 거절한다.
+
+    단계를 낮추면 생략된 노드의 전체 실행 추정치가 더 이상 갱신되지 않으므로,
+    stale_after초가 지난 추정치는 버리고 지연 시간 때문에 낮추는 동안에도
+    probe_interval초마다 한 요청은 부하 단계 그대로 실행하여 추정치를 새로 측정한다.
+
+    전체 응답 시간 EWMA는 빠른 chat 요청과 검색 파이프라인이 섞이므로 단계 결정에
+    쓰지 않고 Retry-After 계산에만 사용한다. rerank/generate는 축소 실행 시 지연 시간이
+    크게 달라지므로 단계별로 따로 기록한다 (예: "generate:short_context").
+    """
+
+    def __init__(
+        self,
+        thresholds: list[int],
+        max_in_flight: int,
+        latency_target: float,
+        alpha: float = 0.2,
+        stale_after: float = 60.0,
+        probe_interval: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.thresholds = sorted(thresholds)
+        self.max_in_flight = max_in_flight
+        self.latency_target = latency_target
+        self.alpha = alpha
+        self.stale_after = stale_after
+        self.probe_interval = probe_interval
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._rejected = 0
+        self._probes = 0
+        self._last_probe = clock()
+        self._latency: float | None = None  # 전체 응답 시간 EWMA (초)
+        # 노드(단계별 키) -> (EWMA(초), 마지막 측정 시각)
+        self._node_latency: dict[str, tuple[float, float]] = {}
+        self._level_counts = [0] * len(DEGRADE_LEVEL_NAMES)
+
+    def admit(self) -> int | None:
+        """요청을 받아들이고 부하 단계를 반환한다. 한도 초과 시 None."""
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                self._rejected += 1
+                return None
+
+            now = self._clock()
+            load_level = min(
+                sum(self._in_flight >= t for t in self.thresholds),
+                DEGRADE_RETRIEVAL_ONLY,
+            )
+            level = load_level
+            # 처리 중인 요청이 없으면 느린 추정치만으로 단계를 낮추지 않는다
+            if self._in_flight > 0:
+                while (
+                    level < DEGRADE_RETRIEVAL_ONLY
+                    and self._predicted_latency(level, now) > self.latency_target
+                ):
+                    level += 1
+                if level > load_level and now - self._last_probe >= self.probe_interval:
+                    # 탐색 요청: 생략 중인 노드의 실제 지연 시간을 다시 측정한다
+                    self._last_probe = now
+                    self._probes += 1
+                    level = load_level
+
+            self._in_flight += 1
+            self._level_counts[level] += 1
+            return level
+
+    def release(self, elapsed: float):
+        with self._lock:
+            self._in_flight -= 1
+            self._latency = self._ewma(self._latency, elapsed)
+
+    def record_node(self, node: str, elapsed: float, level: int = DEGRADE_NONE):
+        key = self._node_key(node, level)
+        with self._lock:
+            now = self._clock()
+            current = self._fresh(key, now)
+            self._node_latency[key] = (self._ewma(current, elapsed), now)
+
+    @staticmethod
+    def _node_key(node: str, level: int) -> str:
+        # 축소 실행된 rerank/generate는 전체 실행과 지연 시간이 달라 따로 기록
+        if node == "rerank" and level > DEGRADE_NONE:
+            return "rerank:skipped"
+        if node == "generate" and level >= DEGRADE_SHORT_CONTEXT:
+            return f"generate:{DEGRADE_LEVEL_NAMES[level]}"
+        return node
+
+    def _fresh(self, key: str, now: float) -> float | None:
+        """stale_after초 이내에 측정된 추정치 (없거나 오래되었으면 None)."""
+        entry = self._node_latency.get(key)
+        if entry is None or now - entry[1] > self.stale_after:
+            return None
+        return entry[0]
+
+    def _predicted_latency(self, level: int, now: float) -> float:
+        """해당 단계로 검색 파이프라인을 실행할 때의 예상 응답 시간(초)."""
+
+        def estimate(key: str, default: float = 0.0) -> float:
+            value = self._fresh(key, now)
+            return default if value is None else value
+
+        # 축소 컨텍스트 생성이 아직 관측되지 않았으면 전체 생성 시간으로 보수적으로 추정
+        full_generate = estimate("generate")
+        return (
+            estimate("router")
+            + estimate("retrieve")
+            + estimate(self._node_key("rerank", level))
+            + estimate(
+                self._node_key("generate", level),
+                full_generate if level < DEGRADE_RETRIEVAL_ONLY else 0.0,
+            )
+        )
+
+    def retry_after(self) -> int:
+        """재시도까지 권장 대기 시간(초) - 최근 평균 응답 시간."""
+        with self._lock:
+            return max(1, math.ceil(self._latency or 1.0))
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = self._clock()
+            return {
+                "in_flight": self._in_flight,
+                "max_in_flight": self.max_in_flight,
+                "thresholds": self.thresholds,
+                "rejected": self._rejected,
+                "probes": self._probes,
+                "latency_ms": round((self._latency or 0.0) * 1000, 1),
+                "node_latency_ms": {
+                    key: round(latency * 1000, 1)
+                    for key in self._node_latency
+                    if (latency := self._fresh(key, now)) is not None
+                },
+                "predicted_latency_ms": {
+                    name: round(self._predicted_latency(level, now) * 1000, 1)
+                    for level, name in enumerate(DEGRADE_LEVEL_NAMES)
+                },
+                "levels": dict(zip(DEGRADE_LEVEL_NAMES, self._level_counts)),
+            }
+
+    def _ewma(self, current: float | None, value: float) -> float:
+        if current is None:
+            return value
+        return self.alpha * value + (1 - self.alpha) * current
@@ -1,20 +1,38 @@
 """FastAPI 웹 서버 - arXiv RAG 시스템 웹 인터페이스."""
 
+import base64
+import binascii
 import json
+import os
 import sys
+import time
+import zlib
 from pathlib import Path
 
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Query, Response
 from fastapi.responses import HTMLResponse
 from pydantic import BaseModel
 
 load_dotenv()
 
+from src.admission import DEGRADE_LEVEL_NAMES, AdmissionController
 from src.graph import build_graph
+from src.nodes import dispatcher, hydrate_documents
+from src.related import get_related_graph
+from src.search import search_index
 
 app = FastAPI(title="arXiv 논문 RAG")
-graph = build_graph()
+graph = build_graph(speculative=os.getenv("RAG_SPECULATIVE") == "1")
+
+
+admission = AdmissionController(
+    thresholds=[int(t) for t in os.getenv("ADMISSION_LEVELS", "8,16,24").split(",")],
+    max_in_flight=int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "32")),
+    latency_target=float(os.getenv("ADMISSION_LATENCY_TARGET", "20")),
+    stale_after=float(os.getenv("ADMISSION_NODE_TTL", "60")),
+    probe_interval=float(os.getenv("ADMISSION_PROBE_INTERVAL", "10")),
+)
 
 
 class Question(BaseModel):
@@ -22,8 +40,20 @@ class Question(BaseModel):
 
 
 @app.post("/ask")
-def ask(q: Question):
-    """질문을 받아 RAG 파이프라인을 실행하고 JSON으로 반환한다."""
+def ask(q: Question, response: Response):
+    """질문을 받아 RAG 파이프라인을 실행하고 JSON으로 반환한다.
+
+    부하에 따라 일부 단계를 생략하며, 적용된 단계는 응답의 degradation 필드와
+    X-Degradation-Level 헤더로 알려준다. 한도를 넘으면 503 + Retry-After로 거절한다.
+    """
+    level = admission.admit()
+    if level is None:
+        raise HTTPException(
+            status_code=503,
+            detail="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해 주세요.",
+            headers={"Retry-After": str(admission.retry_after())},
+        )
+
     initial_state = {
         "question": q.question,
         "documents": [],
@@ -31,12 +61,28 @@ def ask(q: Question):
         "generation": "",
         "steps": [],
         "route": "",
+        "degrade_level": level,
     }
 
-    result = graph.invoke(initial_state)
+    start = last = time.perf_counter()
+    try:
+        # 노드별 지연 시간 측정을 위해 변경분(updates)과 전체 상태(values)를 함께 스트리밍
+        result = initial_state
+        for mode, chunk in graph.stream(initial_state, stream_mode=["updates", "values"]):
+            if mode == "values":
+                result = chunk
+                continue
+            now = time.perf_counter()
+            for node_name in chunk:
+                admission.record_node(node_name, now - last, level)
+            last = now
+    finally:
+        admission.release(time.perf_counter() - start)
+
+    response.headers["X-Degradation-Level"] = str(level)
 
     docs = []
-    for doc in result.get("documents", []):
+    for doc in hydrate_documents(result.get("documents", []), include_content=False):
         meta = doc.get("metadata", {})
         docs.append({
             "title": meta.get("title", ""),
@@ -49,9 +95,97 @@ def ask(q: Question):
         "generation": result.get("generation", "답변을 생성하지 못했습니다."),
         "steps": result.get("steps", []),
         "documents": docs,
+        "degradation": {"level": level, "mode": DEGRADE_LEVEL_NAMES[level]},
+    }
+
+
+def _encode_cursor(offset: int, fingerprint: int) -> str:
+    raw = json.dumps({"o": offset, "f": fingerprint}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, fingerprint: int) -> int:
+    """커서에서 offset을 꺼낸다. 다른 검색 조건으로 만든 커서는 거부한다."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        offset, cursor_fingerprint = int(data["o"]), data["f"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="잘못된 cursor입니다.")
+    if cursor_fingerprint != fingerprint or offset < 0:
+        raise HTTPException(status_code=400, detail="검색 조건과 일치하지 않는 cursor입니다.")
+    return offset
+
+
+@app.get("/search")
+def search(
+    response: Response,
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: str | None = None,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    category: str | None = None,
+    author: str | None = None,
+):
+    """LLM 호출 없이 벡터 검색만으로 논문 순위 목록을 반환한다."""
+    start = time.perf_counter()
+
+    params = json.dumps([q, limit, year_from, year_to, category, author])
+    fingerprint = zlib.crc32(params.encode("utf-8"))
+    offset = _decode_cursor(cursor, fingerprint) if cursor else 0
+
+    results, has_more, timings = search_index(
+        q,
+        limit=limit,
+        offset=offset,
+        year_from=year_from,
+        year_to=year_to,
+        category=category,
+        author=author,
+    )
+
+    total_ms = (time.perf_counter() - start) * 1000
+    response.headers["Server-Timing"] = ", ".join(
+        [f"{name};dur={ms:.2f}" for name, ms in timings.items()]
+        + [f"total;dur={total_ms:.2f}"]
+    )
+    response.headers["X-Response-Time"] = f"{total_ms:.2f}ms"
+
+    return {
+        "results": results,
+        "next_cursor": _encode_cursor(offset + limit, fingerprint) if has_more else None,
     }
 
 
+@app.get("/papers/{paper_id:path}/similar")
+def similar_papers(paper_id: str, limit: int = 10):
+    """미리 계산된 kNN 그래프에서 관련 논문을 반환한다 (LLM/벡터 검색 없음).
+
+    paper_id는 arXiv entry id(URL) 또는 "2401.12345v1" 형식 모두 가능하다.
+    """
+    related = get_related_graph()
+    if related is None:
+        raise HTTPException(status_code=503, detail="관련 논문 그래프가 아직 생성되지 않았습니다.")
+    try:
+        similar = related.neighbors(paper_id, limit=max(1, limit))
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"논문을 찾을 수 없습니다: {paper_id}")
+    return {"id": paper_id, "similar": similar}
+
+
+@app.get("/admission/stats")
+def admission_stats():
+    """동시 처리 수, 노드별 지연 시간, 부하 단계별 요청 수를 반환한다."""
+    return admission.stats()
+
+
+@app.get("/llm/stats")
+def llm_stats():
+    """LLM 디스패처의 대기열 길이와 대기 시간을 반환한다."""
+    return dispatcher.stats()
+
+
 @app.get("/", response_class=HTMLResponse)
 async def index():
     """메인 웹 페이지를 반환한다."""
@@ -346,6 +480,7 @@ questionInput.focus();
 
 
 if __name__ == "__main__":
+    # 개발용 단일 프로세스 실행. 운영 환경은 `python -m src.serve --workers N`을 사용한다.
     import uvicorn
 
     uvicorn.run("src.app:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,152 @@
+"""수집 단계 중복 논문 제거 모듈 (MinHash + LSH).
+
+title + abstract를 단어 3-gram으로 shingling하고 MinHash 서명을 계산한 뒤,
+LSH 밴딩으로 후보 쌍만 비교하여 준중복(near-duplicate) 클러스터를 찾는다.
+같은 arXiv 논문의 다른 버전(`...v1`, `...v2`)은 내용과 무관하게 같은 클러스터로 묶는다.
+"""
+
+import re
+import zlib
+
+import numpy as np
+
+NUM_PERM = 128
+BANDS = 16  # 밴드당 8행 -> 후보 선정 임계값 ≈ (1/16)^(1/8) ≈ 0.71
+SHINGLE_SIZE = 3
+SIMILARITY_THRESHOLD = 0.8  # 추정 Jaccard 유사도가 이 값 이상이면 중복
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(2024)
+_PERM_A = _rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64)
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """텍스트를 정규화한 단어 n-gram 집합의 해시 배열로 변환한다."""
+    tokens = re.findall(r"\w+", text.lower())
+    if len(tokens) < size:
+        grams = {" ".join(tokens)} if tokens else set()
+    else:
+        grams = {" ".join(tokens[i : i + size]) for i in range(len(tokens) - size + 1)}
+    return np.fromiter(
+        (zlib.crc32(gram.encode("utf-8")) % _PRIME for gram in grams),
+        dtype=np.uint64,
+        count=len(grams),
+    )
+
+
+def minhash_signatures(texts: list[str]) -> np.ndarray:
+    """각 텍스트의 MinHash 서명 (n, NUM_PERM) 배열을 계산한다.
+
+    shingle이 없는 텍스트는 서로 다른 값으로 채워 어떤 문서와도 일치하지 않게 한다.
+    """
+    signatures = np.empty((len(texts), NUM_PERM), dtype=np.uint32)
+    for i, text in enumerate(texts):
+        hashes = shingle_hashes(text)
+        if hashes.size == 0:
+            signatures[i] = _PRIME + i  # uint32 범위 내 고유값
+            continue
+        # (a * x + b) mod p 의 최솟값 (순열 x shingle 행렬 연산)
+        permuted = (_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _PRIME
+        signatures[i] = permuted.min(axis=1)
+    return signatures
+
+
+def _base_arxiv_id(paper_id: str) -> str:
+    return re.sub(r"v\d+$", "", paper_id)
+
+
+class _UnionFind:
+    __slots__ = ("parent",)
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, x: int, y: int):
+        rx, ry = self.find(x), self.find(y)
+        if rx != ry:
+            self.parent[max(rx, ry)] = min(rx, ry)
+
+
+def find_duplicate_clusters(
+    papers: list[dict],
+    threshold: float = SIMILARITY_THRESHOLD,
+) -> list[list[int]]:
+    """준중복 논문 클러스터(2편 이상)의 인덱스 리스트를 반환한다.
+
+    LSH 버킷마다 대표(leader) 문서들과만 비교하므로 비교 횟수는 문서 수에 대해
+    거의 선형이다.
+    """
+    uf = _UnionFind(len(papers))
+
+    # 같은 arXiv 논문의 다른 버전
+    first_by_base: dict[str, int] = {}
+    for i, paper in enumerate(papers):
+        base = _base_arxiv_id(paper["id"])
+        if base in first_by_base:
+            uf.union(first_by_base[base], i)
+        else:
+            first_by_base[base] = i
+
+    signatures = minhash_signatures(
+        [f"{paper['title']}\n\n{paper['abstract']}" for paper in papers]
+    )
+    rows = NUM_PERM // BANDS
+    for band in range(BANDS):
+        band_sigs = signatures[:, band * rows : (band + 1) * rows]
+        buckets: dict[bytes, list[int]] = {}
+        for i in range(len(papers)):
+            buckets.setdefault(band_sigs[i].tobytes(), []).append(i)
+
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            leaders: list[int] = []
+            for i in members:
+                for leader in leaders:
+                    if np.mean(signatures[i] == signatures[leader]) >= threshold:
+                        uf.union(leader, i)
+                        break
+                else:
+                    leaders.append(i)
+
+    clusters: dict[int, list[int]] = {}
+    for i in range(len(papers)):
+        clusters.setdefault(uf.find(i), []).append(i)
+    return [members for members in clusters.values() if len(members) > 1]
+
+
+def deduplicate_papers(papers: list[dict]) -> tuple[list[dict], dict[str, str]]:
+    """클러스터마다 대표 논문 하나만 남기고, 나머지는 별칭(alias)으로 기록한다.
+
+    대표는 가장 최근 발행(동일하면 최신 버전 id)된 논문이며, 대표 논문의
+    "aliases" 필드에 나머지 논문 id가 추가된다.
+
+    Returns:
+        (중복 제거된 논문 리스트, {별칭 id: 대표 id}).
+    """
+    dropped: set[int] = set()
+    aliases: dict[str, str] = {}
+    canonical_papers: dict[int, dict] = {}
+
+    for members in find_duplicate_clusters(papers):
+        canonical = max(members, key=lambda i: (papers[i]["published"], papers[i]["id"]))
+        alias_ids = [papers[i]["id"] for i in members if i != canonical]
+        canonical_papers[canonical] = {**papers[canonical], "aliases": alias_ids}
+        for i in members:
+            if i != canonical:
+                dropped.add(i)
+                aliases[papers[i]["id"]] = papers[canonical]["id"]
+
+    deduped = [
+        canonical_papers.get(i, paper)
+        for i, paper in enumerate(papers)
+        if i not in dropped
+    ]
+    return deduped, aliases
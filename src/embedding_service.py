@@ -0,0 +1,106 @@
+"""질의 임베딩 서비스 모듈.
+
+운영 서버(src.serve)는 ONNX 임베딩 모델(all-MiniLM-L6-v2)을 워커마다 올리지 않도록
+모델을 한 번만 로드하는 전용 프로세스를 띄우고, 워커는 Unix 소켓으로 임베딩을 요청한다.
+EMBEDDING_SERVICE_SOCKET이 없으면(개발 서버, 단일 프로세스) 프로세스 안에서 모델을 직접
+로드한다.
+"""
+
+import os
+import threading
+import time
+from multiprocessing.connection import AuthenticationError, Client, Listener
+from pathlib import Path
+
+import numpy as np
+
+SOCKET_ENV = "EMBEDDING_SERVICE_SOCKET"
+AUTHKEY_ENV = "EMBEDDING_SERVICE_AUTHKEY"
+# 서비스 프로세스 시작/재시작 중 연결을 기다리는 최대 시간(초)
+CONNECT_TIMEOUT = float(os.getenv("EMBEDDING_SERVICE_CONNECT_TIMEOUT", "30"))
+
+_local = threading.local()
+_embedding_lock = threading.Lock()
+_embedding_function = None
+
+
+def _get_embedding_function():
+    # ONNX 세션은 fork 이후 안전하지 않으므로 첫 사용 시 생성한다
+    global _embedding_function
+    with _embedding_lock:
+        if _embedding_function is None:
+            from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+
+            _embedding_function = DefaultEmbeddingFunction()
+        return _embedding_function
+
+
+def _connect(address: str):
+    authkey = bytes.fromhex(os.environ[AUTHKEY_ENV])
+    deadline = time.monotonic() + CONNECT_TIMEOUT
+    while True:
+        try:
+            return Client(address, family="AF_UNIX", authkey=authkey)
+        except (FileNotFoundError, ConnectionRefusedError):
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.1)
+
+
+def embed_texts(texts: list[str]) -> np.ndarray:
+    """텍스트 목록의 임베딩 (len(texts), dim) 배열을 반환한다."""
+    address = os.getenv(SOCKET_ENV)
+    if not address:
+        return np.asarray(_get_embedding_function()(texts), dtype=np.float32)
+
+    # 스레드마다 연결 하나를 재사용하고, 서비스가 재시작되어 끊긴 경우 한 번 다시 연결한다
+    for attempt in range(2):
+        conn = getattr(_local, "conn", None)
+        if conn is None:
+            conn = _local.conn = _connect(address)
+        try:
+            conn.send(list(texts))
+            result = conn.recv()
+            break
+        except (OSError, EOFError):
+            _local.conn = None
+            conn.close()
+            if attempt == 1:
+                raise
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def _handle(conn, embedding_function):
+    with conn:
+        while True:
+            try:
+                texts = conn.recv()
+            except (EOFError, OSError):
+                return
+            try:
+                result = np.asarray(embedding_function(texts), dtype=np.float32)
+            except Exception as e:
+                result = RuntimeError(f"임베딩 실패: {e!r}")
+            conn.send(result)
+
+
+def serve_embeddings(address: str, authkey: bytes):
+    """임베딩 서비스 프로세스 본체. 모델을 한 번 로드하고 연결마다 스레드로 응답한다."""
+    embedding_function = _get_embedding_function()
+    embedding_function(["warmup"])
+
+    Path(address).unlink(missing_ok=True)
+    listener = Listener(address, family="AF_UNIX", authkey=authkey)
+    print(f"[embedding] {os.getpid()} 실행 중 ({address})")
+    with listener:
+        while True:
+            try:
+                conn = listener.accept()
+            except (AuthenticationError, OSError) as e:
+                print(f"[embedding] 연결 거부: {e!r}")
+                continue
+            threading.Thread(
+                target=_handle, args=(conn, embedding_function), daemon=True
+            ).start()
@@ -8,6 +8,7 @@ from src.nodes import (
     reranker_node,
     retriever_node,
     router_node,
+    speculative_router_node,
 )
 from src.state import AgentState
 
@@ -19,18 +20,26 @@ def route_decision(state: AgentState) -> str:
     return "chat"
 
 
-def build_graph() -> StateGraph:
+def build_graph(speculative: bool = False) -> StateGraph:
     """RAG 워크플로우 그래프를 구성한다.
 
     Flow:
         Router -> (retrieve) -> Retriever -> Reranker -> Generator -> END
         Router -> (chat) -> Chat -> END
+
+    Args:
+        speculative: True이면 Router가 라우팅과 동시에 검색어 추출 및 벡터 검색을
+            미리 실행하고, retrieve 경로에서는 Retriever 노드 없이 바로 Reranker로 간다.
+            (Router(+추측 검색) -> (retrieve) -> Reranker -> Generator -> END)
     """
     workflow = StateGraph(AgentState)
 
     # 노드 추가
-    workflow.add_node("router", router_node)
-    workflow.add_node("retrieve", retriever_node)
+    if speculative:
+        workflow.add_node("router", speculative_router_node)
+    else:
+        workflow.add_node("router", router_node)
+        workflow.add_node("retrieve", retriever_node)
     workflow.add_node("rerank", reranker_node)
     workflow.add_node("generate", generator_node)
     workflow.add_node("chat", chat_node)
@@ -42,12 +51,13 @@ def build_graph() -> StateGraph:
         "router",
         route_decision,
         {
-            "retrieve": "retrieve",
+            "retrieve": "rerank" if speculative else "retrieve",
             "chat": "chat",
         },
     )
 
-    workflow.add_edge("retrieve", "rerank")
+    if not speculative:
+        workflow.add_edge("retrieve", "rerank")
     workflow.add_edge("rerank", "generate")
     workflow.add_edge("generate", END)
     workflow.add_edge("chat", END)
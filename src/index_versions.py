@@ -0,0 +1,122 @@
+"""ChromaDB 인덱스 스냅샷 버전 관리 모듈.
+
+인덱싱은 항상 새 버전 디렉터리(`chroma_db/versions/<버전>/`)에 수행되고, 검증을 통과한
+버전만 `chroma_db/CURRENT` 포인터 파일을 원자적으로 교체(os.replace)하여 승격된다.
+서버는 포인터 파일을 주기적으로 확인하여 재시작 없이 새 버전으로 전환한다.
+"""
+
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+
+CHROMA_DIR = Path(__file__).parent.parent / "chroma_db"
+VERSIONS_DIR = CHROMA_DIR / "versions"
+CURRENT_FILE = CHROMA_DIR / "CURRENT"
+MANIFEST_NAME = "manifest.json"
+
+# 롤백을 위해 보관할 검증 완료 스냅샷 수 (현재 버전 포함)
+KEEP_VERSIONS = 3
+
+
+def new_version() -> str:
+    """새 스냅샷 버전 이름을 만든다 (UTC 시각 기반, 사전순 = 생성순)."""
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+
+
+def version_dir(version: str) -> Path:
+    """버전의 ChromaDB 저장 경로를 반환한다."""
+    return VERSIONS_DIR / version
+
+
+def write_manifest(version: str, manifest: dict):
+    """검증을 통과한 버전에 manifest를 기록한다 (승격 가능 표시)."""
+    path = version_dir(version) / MANIFEST_NAME
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def read_manifest(version: str) -> dict | None:
+    path = version_dir(version) / MANIFEST_NAME
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def list_versions() -> list[str]:
+    """검증을 통과한(manifest가 있는) 버전 목록을 오래된 순으로 반환한다."""
+    if not VERSIONS_DIR.exists():
+        return []
+    return sorted(
+        path.name
+        for path in VERSIONS_DIR.iterdir()
+        if (path / MANIFEST_NAME).exists()
+    )
+
+
+def current_version() -> str | None:
+    """현재 서비스 중인 버전을 반환한다 (포인터가 없으면 None)."""
+    try:
+        return json.loads(CURRENT_FILE.read_text(encoding="utf-8"))["version"]
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return None
+
+
+def current_index_dir() -> tuple[str | None, Path]:
+    """현재 서비스 중인 (버전, ChromaDB 경로)를 반환한다.
+
+    포인터가 없으면 버전 관리 이전의 `chroma_db/`를 그대로 사용한다.
+    """
+    version = current_version()
+    if version is None:
+        return None, CHROMA_DIR
+    return version, version_dir(version)
+
+
+def promote(version: str):
+    """검증된 버전을 현재 버전으로 원자적으로 승격한다."""
+    if read_manifest(version) is None:
+        raise ValueError(f"검증되지 않은 버전은 승격할 수 없습니다: {version}")
+
+    pointer = {
+        "version": version,
+        "promoted_at": datetime.now(timezone.utc).isoformat(),
+    }
+    tmp_path = CURRENT_FILE.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(pointer), encoding="utf-8")
+    os.replace(tmp_path, CURRENT_FILE)
+    print(f"인덱스 버전 승격: {version}")
+
+
+def rollback(version: str | None = None) -> str:
+    """지정한 버전(기본: 현재 직전 버전)으로 즉시 되돌린다."""
+    if version is None:
+        current = current_version()
+        older = [v for v in list_versions() if current is None or v < current]
+        if not older:
+            raise ValueError("되돌릴 이전 버전이 없습니다.")
+        version = older[-1]
+    promote(version)
+    return version
+
+
+def gc_versions(keep: int = KEEP_VERSIONS, exclude: tuple[str, ...] = ()):
+    """오래된 스냅샷과 검증에 실패한 빌드 디렉터리를 삭제한다.
+
+    현재 버전과 최신 keep개 버전, exclude에 지정한 버전(진행 중인 빌드)은 남긴다.
+    """
+    if not VERSIONS_DIR.exists():
+        return
+
+    current = current_version()
+    retained = set(list_versions()[-keep:]) | set(exclude)
+    if current:
+        retained.add(current)
+
+    for path in VERSIONS_DIR.iterdir():
+        if path.name in retained:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        print(f"  스냅샷 삭제: {path.name}")
@@ -1,62 +1,305 @@
 """arXiv 논문 수집 및 ChromaDB 인덱싱 모듈."""
 
+import argparse
+import hashlib
 import json
 import os
+import random
+import shutil
 import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
-import arxiv
 import chromadb
+import numpy as np
 from dotenv import load_dotenv
 
+from src.dedup import deduplicate_papers
+from src.index_versions import (
+    current_version,
+    gc_versions,
+    list_versions,
+    new_version,
+    promote,
+    read_manifest,
+    rollback,
+    version_dir,
+    write_manifest,
+)
+from src.related import KNN_FILENAME, KnnGraph, build_knn_graph
+from src.vector_index import VectorIndex
+
 load_dotenv()
 
 DATA_DIR = Path(__file__).parent.parent / "data"
-CHROMA_DIR = Path(__file__).parent.parent / "chroma_db"
 COLLECTION_NAME = "arxiv_papers"
 
+DEFAULT_ARXIV_API_URL = "https://export.arxiv.org/api/query"
+# 로컬 대역 서버로 바꿔 끼울 수 있도록 환경 변수로 재정의 가능
+ARXIV_API_URL = os.getenv("ARXIV_API_URL", DEFAULT_ARXIV_API_URL)
+
+# arXiv 원본 Atom 페이지 캐시 (중단된 수집 이어받기 / 오프라인 재생 / 대역 서버 원본)
+ARXIV_PAGE_DIR = DATA_DIR / "pages"
+# 수집기가 쓰는 페이지 캐시. 대역 서버 등 다른 API를 쓰면 원본 캐시를 읽지 않도록 분리한다
+PAGE_CACHE_DIR = Path(
+    os.getenv("ARXIV_PAGE_CACHE_DIR")
+    or (ARXIV_PAGE_DIR if ARXIV_API_URL == DEFAULT_ARXIV_API_URL else DATA_DIR / "pages-standin")
+)
+RUN_MANIFEST_NAME = "run.json"
+
+# 새 스냅샷의 문서 수가 현재 버전보다 이 비율 넘게 줄면 승격을 거부한다 (수집 누락 방지)
+INDEX_MAX_SHRINK = float(os.getenv("INDEX_MAX_SHRINK", "0.2"))
+
+ATOM_NS = {
+    "atom": "http://www.w3.org/2005/Atom",
+    "opensearch": "http://a9.com/-/spec/opensearch/1.1/",
+}
+
+
+class PageFetchError(RuntimeError):
+    """재시도 후에도 arXiv 결과 페이지를 받지 못했을 때 발생한다."""
+
+
+def build_page_url(query: str, start: int, page_size: int) -> str:
+    """arXiv API 결과 페이지 URL을 만든다 (최신 등록일 내림차순)."""
+    params = {
+        "search_query": query,
+        "start": start,
+        "max_results": page_size,
+        "sortBy": "submittedDate",
+        "sortOrder": "descending",
+    }
+    return f"{ARXIV_API_URL}?{urllib.parse.urlencode(params)}"
+
+
+def fetch_page(
+    url: str,
+    retries: int = 5,
+    backoff: float = 3.0,
+    timeout: float = 30.0,
+) -> str:
+    """Atom 결과 페이지를 받아온다. 실패 시 지수 백오프(+지터)로 재시도한다."""
+    for attempt in range(retries + 1):
+        try:
+            with urllib.request.urlopen(url, timeout=timeout) as resp:
+                return resp.read().decode("utf-8")
+        except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+            # 4xx(429 제외)는 재시도해도 소용없다
+            if isinstance(e, urllib.error.HTTPError) and e.code < 500 and e.code != 429:
+                raise PageFetchError(f"{url}: HTTP {e.code}") from e
+            if attempt == retries:
+                raise PageFetchError(f"{url}: {e}") from e
+            wait = backoff * (2**attempt) * random.uniform(0.5, 1.5)
+            print(f"  페이지 요청 실패 ({e}), {wait:.1f}초 후 재시도 ({attempt + 1}/{retries})")
+            time.sleep(wait)
+    raise PageFetchError(url)
+
+
+def parse_atom_page(xml_text: str) -> tuple[list[dict], int]:
+    """Atom 페이지를 논문 딕셔너리 리스트와 전체 결과 수로 변환한다."""
+    root = ET.fromstring(xml_text)
+    total = int(root.findtext("opensearch:totalResults", "0", ATOM_NS) or 0)
+
+    papers = []
+    for entry in root.findall("atom:entry", ATOM_NS):
+        entry_id = entry.findtext("atom:id", "", ATOM_NS).strip()
+        published = entry.findtext("atom:published", "", ATOM_NS).strip()
+        papers.append({
+            "id": entry_id,
+            "title": " ".join(entry.findtext("atom:title", "", ATOM_NS).split()),
+            "abstract": entry.findtext("atom:summary", "", ATOM_NS).strip(),
+            "url": entry_id,
+            "categories": [
+                cat.get("term") for cat in entry.findall("atom:category", ATOM_NS)
+            ],
+            "published": datetime.fromisoformat(
+                published.replace("Z", "+00:00")
+            ).isoformat(),
+            "authors": [
+                author.findtext("atom:name", "", ATOM_NS).strip()
+                for author in entry.findall("atom:author", ATOM_NS)
+            ],
+        })
+    return papers, total
+
+
+def page_cache_dir(query: str, cache_dir: Path = PAGE_CACHE_DIR) -> Path:
+    """검색 쿼리별 페이지 캐시 디렉터리를 반환한다."""
+    key = hashlib.sha1(query.encode("utf-8")).hexdigest()[:12]
+    return cache_dir / key
+
+
+def _read_run_manifest(pages_dir: Path) -> dict | None:
+    try:
+        return json.loads((pages_dir / RUN_MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _write_run_manifest(pages_dir: Path, manifest: dict):
+    path = pages_dir / RUN_MANIFEST_NAME
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(manifest), encoding="utf-8")
+    os.replace(tmp_path, path)
+
 
 def fetch_arxiv_papers(
     category: str = "cs.CL",
     max_results: int = 5000,
     delay: float = 3.0,
+    page_size: int = 100,
+    replay: bool = False,
+    refresh: bool = False,
+    cache_dir: Path = PAGE_CACHE_DIR,
+    retries: int = 5,
 ) -> list[dict]:
     """arXiv API로부터 논문 메타데이터를 수집한다.
 
+    받아온 Atom 페이지는 원본 그대로 페이지 캐시에 저장된다. 캐시는 실행 단위로
+    관리되어(run.json), 중단된 실행을 다시 시작하면 이미 받은 페이지는 건너뛰고
+    이어받으며, 이전 실행이 완료되었으면 캐시를 비우고 최신 결과를 처음부터 받는다.
+
     Args:
         category: arXiv 카테고리 (기본: cs.CL).
         max_results: 수집할 논문 수.
         delay: API 호출 간 딜레이(초).
+        page_size: 페이지당 결과 수.
+        replay: True이면 네트워크 없이 캐시된 페이지만으로 수집한다.
+        refresh: True이면 중단된 실행이 있어도 캐시를 비우고 처음부터 받는다.
+        cache_dir: 페이지 캐시 루트 디렉터리.
+        retries: 페이지당 최대 재시도 횟수.
 
     Returns:
         논문 메타데이터 딕셔너리 리스트.
     """
-    search = arxiv.Search(
-        query=f"cat:{category}",
-        max_results=max_results,
-        sort_by=arxiv.SortCriterion.SubmittedDate,
-        sort_order=arxiv.SortOrder.Descending,
-    )
+    query = f"cat:{category}"
+    pages_dir = page_cache_dir(query, cache_dir)
+    pages_dir.mkdir(parents=True, exist_ok=True)
+
+    if not replay:
+        run = _read_run_manifest(pages_dir)
+        if refresh or run is None or run.get("complete") or run.get("page_size") != page_size:
+            # 새 실행: 이전 실행의 페이지는 최신 결과가 아니므로 비운다
+            for page_path in pages_dir.glob("page_*.xml"):
+                page_path.unlink()
+            run = {
+                "complete": False,
+                "started_at": datetime.now().astimezone().isoformat(),
+                "page_size": page_size,
+            }
+            _write_run_manifest(pages_dir, run)
+        else:
+            print(f"  중단된 수집 실행 이어받기 (시작: {run['started_at']})")
 
     papers = []
-    client = arxiv.Client(page_size=100, delay_seconds=delay)
-
-    for result in client.results(search):
-        paper = {
-            "id": result.entry_id,
-            "title": result.title,
-            "abstract": result.summary,
-            "url": result.entry_id,
-            "categories": [cat for cat in result.categories],
-            "published": result.published.isoformat(),
-            "authors": [author.name for author in result.authors],
-        }
-        papers.append(paper)
-
-    print(f"총 {len(papers)}편의 논문을 수집했습니다.")
+    last_request = 0.0
+    cached_pages = fetched_pages = 0
+    # 오류 응답은 totalResults=0으로 오기도 하므로 지금까지 본 최댓값을 기준으로 삼는다
+    known_total = 0
+
+    for start in range(0, max_results, page_size):
+        size = min(page_size, max_results - start)
+        page_path = pages_dir / f"page_{start:07d}_{size}.xml"
+
+        if page_path.exists():
+            page_papers, total = parse_atom_page(page_path.read_text(encoding="utf-8"))
+            cached_pages += 1
+        elif replay:
+            print(f"  캐시된 페이지 없음 (start={start}), 재생을 종료합니다.")
+            break
+        else:
+            url = build_page_url(query, start, size)
+            for attempt in range(retries + 1):
+                # arXiv API rate limit 준수: 직전 요청 이후 delay초 대기
+                wait = last_request + delay - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                last_request = time.monotonic()
+                xml_text = fetch_page(url, retries=retries, backoff=delay)
+                page_papers, total = parse_atom_page(xml_text)
+                known_total = max(known_total, total)
+                # arXiv는 간헐적으로 빈 페이지를 돌려주므로 재시도한다
+                if page_papers or start >= known_total:
+                    break
+                if attempt == retries:
+                    # 실행을 미완료로 남겨 두어 다음 실행이 이 페이지부터 이어받게 한다
+                    raise PageFetchError(
+                        f"{url}: 재시도 후에도 빈 페이지 (start={start}, total={known_total})"
+                    )
+                print(f"  빈 페이지 수신 (start={start}), 재시도 ({attempt + 1}/{retries})")
+
+            if page_papers:
+                # 완료된 페이지만 원자적으로 저장 (중단되어도 반쪽 파일이 남지 않음)
+                tmp_path = page_path.with_suffix(".tmp")
+                tmp_path.write_text(xml_text, encoding="utf-8")
+                os.replace(tmp_path, page_path)
+            fetched_pages += 1
+
+        known_total = max(known_total, total)
+        papers.extend(page_papers)
+        print(f"  수집 진행: {len(papers)}/{min(max_results, known_total)}")
+        if not page_papers or start + size >= known_total:
+            break
+
+    if not replay:
+        _write_run_manifest(pages_dir, {
+            **run,
+            "complete": True,
+            "completed_at": datetime.now().astimezone().isoformat(),
+            "papers": len(papers),
+        })
+
+    print(
+        f"총 {len(papers)}편의 논문을 수집했습니다. "
+        f"(캐시 {cached_pages}페이지, 네트워크 {fetched_pages}페이지)"
+    )
     return papers
 
 
+def serve_page_cache(
+    port: int = 8765,
+    category: str = "cs.CL",
+    cache_dir: Path = ARXIV_PAGE_DIR,
+):
+    """캐시된 페이지를 arXiv API처럼 응답하는 로컬 대역 서버를 실행한다.
+
+    ARXIV_API_URL=http://localhost:<port>/api/query 로 지정하면 네트워크 없이
+    HTTP 요청/파싱을 포함한 전체 수집 파이프라인을 그대로 실행(벤치마크)할 수 있다.
+    이때 수집기는 별도의 페이지 캐시(기본 data/pages-standin/)를 사용한다.
+    """
+    pages_dir = page_cache_dir(f"cat:{category}", cache_dir)
+
+    class PageCacheHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            params = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+            start = int(params.get("start", ["0"])[0])
+            size = int(params.get("max_results", ["100"])[0])
+            page_path = pages_dir / f"page_{start:07d}_{size}.xml"
+            if not page_path.exists():
+                self.send_error(404, f"cached page not found: start={start}")
+                return
+            body = page_path.read_bytes()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/atom+xml; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), PageCacheHandler)
+    print(f"페이지 캐시 대역 서버 실행: http://127.0.0.1:{port}/api/query ({pages_dir})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
 def save_papers_json(papers: list[dict], filename: str = "papers.json") -> Path:
     """수집한 논문 데이터를 JSON 파일로 저장한다."""
     DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -67,19 +310,29 @@ def save_papers_json(papers: list[dict], filename: str = "papers.json") -> Path:
     return filepath
 
 
-def index_to_chromadb(papers: list[dict]) -> chromadb.Collection:
-    """논문 데이터를 ChromaDB에 인덱싱한다.
+class IndexValidationError(RuntimeError):
+    """새로 빌드한 인덱스 스냅샷이 검증을 통과하지 못했을 때 발생한다."""
+
+
+def save_aliases_json(aliases: dict[str, str], filename: str = "aliases.json") -> Path:
+    """중복 제거된 논문의 {별칭 id: 대표 id} 매핑을 JSON 파일로 저장한다."""
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    filepath = DATA_DIR / filename
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump(aliases, f, ensure_ascii=False, indent=2)
+    print(f"별칭 매핑을 {filepath}에 저장했습니다.")
+    return filepath
+
+
+def index_to_chromadb(papers: list[dict], version: str) -> chromadb.Collection:
+    """논문 데이터를 새 버전의 ChromaDB 스냅샷에 인덱싱한다.
 
     title + abstract를 결합하여 임베딩하고, 메타데이터와 함께 저장한다.
+    서비스 중인 인덱스는 건드리지 않으며, 승격은 검증 후 별도로 수행한다.
     """
-    CHROMA_DIR.mkdir(parents=True, exist_ok=True)
-    client = chromadb.PersistentClient(path=str(CHROMA_DIR))
-
-    # 기존 컬렉션이 있으면 삭제 후 재생성
-    try:
-        client.delete_collection(name=COLLECTION_NAME)
-    except Exception:
-        pass
+    path = version_dir(version)
+    path.mkdir(parents=True, exist_ok=False)
+    client = chromadb.PersistentClient(path=str(path))
 
     collection = client.create_collection(
         name=COLLECTION_NAME,
@@ -101,7 +354,9 @@ def index_to_chromadb(papers: list[dict]) -> chromadb.Collection:
                 "url": paper["url"],
                 "categories": ", ".join(paper["categories"]),
                 "published": paper["published"],
+                "year": int(paper["published"][:4]),
                 "authors": ", ".join(paper["authors"][:5]),
+                "aliases": ", ".join(paper.get("aliases", [])),
             }
             for paper in batch
         ]
@@ -113,23 +368,217 @@ def index_to_chromadb(papers: list[dict]) -> chromadb.Collection:
         )
         print(f"  인덱싱 진행: {min(i + batch_size, len(papers))}/{len(papers)}")
 
-    print(f"ChromaDB 인덱싱 완료: {collection.count()}개 문서")
+    print(f"ChromaDB 인덱싱 완료 (버전 {version}): {collection.count()}개 문서")
     return collection
 
 
-def run_ingestion():
+def validate_index(
+    collection: chromadb.Collection,
+    papers: list[dict],
+    allow_shrink: bool = False,
+):
+    """승격 전에 스냅샷이 온전한지 확인한다 (문서 수, id 조회, 샘플 검색).
+
+    allow_shrink가 False이면 현재 버전보다 문서 수가 INDEX_MAX_SHRINK 비율 넘게
+    줄어든 스냅샷(수집 누락 의심)을 거부한다.
+    """
+    expected = len({paper["id"] for paper in papers})
+    count = collection.count()
+    if count != expected or count == 0:
+        raise IndexValidationError(f"문서 수 불일치: {count} != {expected}")
+
+    current = current_version()
+    manifest = read_manifest(current) if current else None
+    if manifest and not allow_shrink and count < manifest["count"] * (1 - INDEX_MAX_SHRINK):
+        raise IndexValidationError(
+            f"문서 수 급감: 현재 버전 {current} {manifest['count']}개 -> {count}개 "
+            f"(의도한 변경이면 --allow-shrink로 승격)"
+        )
+
+    sample = papers[:: max(1, len(papers) // 10)][:10]
+    found = collection.get(ids=[paper["id"] for paper in sample], include=[])
+    if len(found["ids"]) != len({paper["id"] for paper in sample}):
+        raise IndexValidationError("샘플 문서 id 조회 실패")
+
+    results = collection.query(
+        query_texts=[sample[0]["title"]], n_results=5, include=[]
+    )
+    if sample[0]["id"] not in results["ids"][0]:
+        raise IndexValidationError("샘플 검색에서 자기 자신을 찾지 못했습니다.")
+    print(f"인덱스 검증 통과: {count}개 문서")
+
+
+def read_embeddings(
+    collection: chromadb.Collection,
+) -> tuple[list[str], np.ndarray, list[dict]]:
+    """스냅샷의 전체 (id, 임베딩, 메타데이터)를 배치 단위로 읽는다."""
+    ids, embeddings, metadatas = [], [], []
+    batch_size = 1000
+    for offset in range(0, collection.count(), batch_size):
+        batch = collection.get(
+            limit=batch_size, offset=offset, include=["embeddings", "metadatas"]
+        )
+        ids.extend(batch["ids"])
+        embeddings.append(np.asarray(batch["embeddings"], dtype=np.float32))
+        metadatas.extend(meta or {} for meta in batch["metadatas"])
+    return ids, np.concatenate(embeddings), metadatas
+
+
+def build_vector_index(
+    ids: list[str],
+    embeddings: np.ndarray,
+    metadatas: list[dict],
+    version: str,
+) -> VectorIndex:
+    """서버가 mmap으로 공유할 벡터 인덱스(임베딩 행렬 + 필터용 메타데이터)를 저장한다."""
+    index = VectorIndex.from_metadatas(ids, embeddings, metadatas)
+    index.save(version_dir(version))
+    print(f"벡터 인덱스 저장 완료: {len(index)}개 문서, {index.vectors.nbytes / 1e6:.1f}MB")
+    return index
+
+
+def backfill_vector_index(version: str | None = None) -> VectorIndex:
+    """벡터 인덱스가 없는 기존 스냅샷(기본: 현재 버전)에 벡터 인덱스를 만든다."""
+    version = version or current_version()
+    if version is None:
+        raise ValueError("버전 관리되는 인덱스 스냅샷이 없습니다.")
+    client = chromadb.PersistentClient(path=str(version_dir(version)))
+    collection = client.get_collection(name=COLLECTION_NAME)
+    return build_vector_index(*read_embeddings(collection), version)
+
+
+def build_related_graph(
+    ids: list[str],
+    embeddings: np.ndarray,
+    metadatas: list[dict],
+    version: str,
+) -> KnnGraph:
+    """스냅샷의 전체 임베딩으로 관련 논문 kNN 그래프를 만들어 저장한다.
+
+    현재 서비스 중인 버전에 그래프가 있으면 추가/삭제된 논문의 영향을 받는 행만 증분 계산한다.
+    """
+    previous = None
+    current = current_version()
+    if current and (version_dir(current) / KNN_FILENAME).exists():
+        previous = KnnGraph.load(version_dir(current) / KNN_FILENAME)
+
+    graph = build_knn_graph(
+        ids,
+        embeddings,
+        [meta.get("title", "") for meta in metadatas],
+        [meta.get("url", "") for meta in metadatas],
+        previous=previous,
+    )
+    graph.save(version_dir(version) / KNN_FILENAME)
+    print(f"관련 논문 그래프 생성 완료: {len(graph)}편, 이웃 {graph.indices.size}개")
+    return graph
+
+
+def build_index_version(papers: list[dict], allow_shrink: bool = False) -> str:
+    """새 스냅샷을 빌드/검증한 뒤 승격하고, 오래된 스냅샷을 정리한다.
+
+    검증에 실패하면 빌드한 스냅샷을 삭제하고 서비스 중인 버전은 그대로 유지한다.
+    """
+    version = new_version()
+    try:
+        collection = index_to_chromadb(papers, version)
+        validate_index(collection, papers, allow_shrink=allow_shrink)
+        ids, embeddings, metadatas = read_embeddings(collection)
+        build_vector_index(ids, embeddings, metadatas, version)
+        build_related_graph(ids, embeddings, metadatas, version)
+    except Exception:
+        shutil.rmtree(version_dir(version), ignore_errors=True)
+        print(f"스냅샷 {version} 빌드 실패, 현재 버전 유지: {current_version()}")
+        raise
+
+    write_manifest(version, {
+        "version": version,
+        "count": collection.count(),
+        "collection": COLLECTION_NAME,
+        "created_at": datetime.now().astimezone().isoformat(),
+    })
+    promote(version)
+    gc_versions(exclude=(version,))
+    return version
+
+
+def run_ingestion(
+    replay: bool = False,
+    refresh: bool = False,
+    delay: float = 3.0,
+    allow_shrink: bool = False,
+):
     """전체 수집-저장-인덱싱 파이프라인을 실행한다."""
     print("=== arXiv 논문 수집 시작 ===")
-    papers = fetch_arxiv_papers()
+    papers = fetch_arxiv_papers(delay=delay, replay=replay, refresh=refresh)
+
+    print("\n=== 중복 논문 제거 ===")
+    papers, aliases = deduplicate_papers(papers)
+    print(f"대표 논문 {len(papers)}편, 별칭 {len(aliases)}편")
 
     print("\n=== JSON 파일 저장 ===")
     save_papers_json(papers)
+    save_aliases_json(aliases)
 
     print("\n=== ChromaDB 인덱싱 시작 ===")
-    index_to_chromadb(papers)
+    build_index_version(papers, allow_shrink=allow_shrink)
 
     print("\n=== 수집 및 인덱싱 완료 ===")
 
 
 if __name__ == "__main__":
-    run_ingestion()
+    parser = argparse.ArgumentParser(description="arXiv 논문 수집 및 인덱싱")
+    parser.add_argument(
+        "--replay", action="store_true", help="캐시된 페이지만으로 수집 (네트워크 미사용)"
+    )
+    parser.add_argument(
+        "--refresh", action="store_true", help="중단된 수집 실행을 버리고 처음부터 수집"
+    )
+    parser.add_argument(
+        "--delay", type=float, default=3.0, help="API 호출 간 딜레이(초, 기본 3)"
+    )
+    parser.add_argument(
+        "--allow-shrink",
+        action="store_true",
+        help="문서 수가 현재 버전보다 크게 줄어도 새 스냅샷을 승격",
+    )
+    parser.add_argument(
+        "--serve-cache", type=int, metavar="PORT", help="페이지 캐시 대역 서버 실행"
+    )
+    parser.add_argument(
+        "--list-versions", action="store_true", help="인덱스 스냅샷 버전 목록 출력"
+    )
+    parser.add_argument(
+        "--build-vectors",
+        nargs="?",
+        const="",
+        metavar="VERSION",
+        help="벡터 인덱스가 없는 스냅샷(기본: 현재 버전)에 벡터 인덱스 생성",
+    )
+    parser.add_argument(
+        "--rollback",
+        nargs="?",
+        const="",
+        metavar="VERSION",
+        help="지정한 버전(기본: 직전 버전)으로 인덱스 되돌리기",
+    )
+    args = parser.parse_args()
+
+    if args.serve_cache:
+        serve_page_cache(port=args.serve_cache)
+    elif args.list_versions:
+        current = current_version()
+        for version in list_versions():
+            marker = "*" if version == current else " "
+            print(f"{marker} {version}  ({read_manifest(version)['count']}개 문서)")
+    elif args.build_vectors is not None:
+        backfill_vector_index(args.build_vectors or None)
+    elif args.rollback is not None:
+        rollback(args.rollback or None)
+    else:
+        run_ingestion(
+            replay=args.replay,
+            refresh=args.refresh,
+            delay=args.delay,
+            allow_shrink=args.allow_shrink,
+        )
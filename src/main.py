@@ -1,5 +1,6 @@
 """CLI 실행 진입점."""
 
+import os
 import sys
 from pathlib import Path
 
@@ -18,7 +19,7 @@ def main():
     print("  종료하려면 'quit' 또는 'exit'를 입력하세요.")
     print("=" * 60)
 
-    graph = build_graph()
+    graph = build_graph(speculative=os.getenv("RAG_SPECULATIVE") == "1")
 
     while True:
         print()
@@ -41,20 +42,19 @@ def main():
             "generation": "",
             "steps": [],
             "route": "",
+            "degrade_level": 0,
         }
 
         print("\n처리 중...")
         print("-" * 40)
 
-        # 스트리밍 출력: 각 노드 실행 결과를 순차적으로 표시
+        # 스트리밍 출력: 각 노드가 반환한 변경분(delta)을 순차적으로 표시
         final_state = None
         for event in graph.stream(initial_state):
             for node_name, node_state in event.items():
                 final_state = node_state
-                steps = node_state.get("steps", [])
-                if steps:
-                    latest_step = steps[-1]
-                    print(f"[{node_name}] {latest_step}")
+                for step in node_state.get("steps", []):
+                    print(f"[{node_name}] {step}")
 
         # 최종 답변 출력
         print("-" * 40)
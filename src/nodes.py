@@ -3,35 +3,444 @@
 Router, Retriever, Reranker, Generator 노드를 정의한다.
 """
 
+import heapq
+import itertools
 import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Callable
 
 import chromadb
+import numpy as np
+import openai
 from dotenv import load_dotenv
+from langchain_core.messages import AIMessage
 from langchain_openai import ChatOpenAI
 
-from src.state import AgentState
+from src.admission import (
+    DEGRADE_NONE,
+    DEGRADE_RETRIEVAL_ONLY,
+    DEGRADE_SHORT_CONTEXT,
+    DEGRADE_SKIP_RERANK,
+)
+from src.embedding_service import embed_texts
+from src.index_versions import current_index_dir
+from src.state import AgentState, DocRef
+from src.vector_index import get_vector_index
 
 load_dotenv()
 
-CHROMA_DIR = Path(__file__).parent.parent / "chroma_db"
 COLLECTION_NAME = "arxiv_papers"
+# 인덱스 버전 포인터 확인 주기(초)
+INDEX_RELOAD_INTERVAL = float(os.getenv("INDEX_RELOAD_INTERVAL", "1.0"))
+
+# 멀티 쿼리 검색: 검색어 변형 개수 (1이면 단일 검색어) 및 RRF 상수
+MULTI_QUERY_VARIANTS = int(os.getenv("MULTI_QUERY_VARIANTS", "1"))
+RRF_K = 60
+
+
+# ── LLM Dispatcher ───────────────────────────────────────────────────────────
+
+# 숫자가 작을수록 먼저 처리된다
+PRIORITY_INTERACTIVE = 0  # Router, 검색어 추출, 일반 대화 (짧고 지연에 민감)
+PRIORITY_GENERATION = 1  # Reranker, Generator (긴 프롬프트)
+
+# 재시도 대상 오류 (레이트 리밋, 일시적 네트워크/서버 오류)
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+    TimeoutError,
+    ConnectionError,
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """프롬프트 토큰 수를 보수적으로 추정한다 (한국어 비중이 높아 2자당 1토큰)."""
+    return len(text) // 2 + 1
+
+
+class TokenBucket:
+    """분당 한도를 초 단위로 보충하는 토큰 버킷."""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """amount만큼 사용할 수 있을 때까지 남은 시간(초)."""
+        self.refill(now)
+        # 한도보다 큰 요청은 버킷이 가득 찰 때까지만 기다린다
+        deficit = min(amount, self.capacity) - self.tokens
+        return max(0.0, deficit / self.rate)
+
+    def consume(self, amount: float):
+        # 실제 사용량 정산 시 음수(빚)가 될 수 있다
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class StubChatModel:
+    """네트워크 없이 디스패처를 테스트하기 위한 로컬 LLM 백엔드.
+
+    Args:
+        reply: 고정 응답 문자열.
+        responder: 프롬프트를 받아 응답 문자열을 만드는 함수 (지정 시 reply 대신 사용).
+        latency: 호출당 지연(초).
+        failures: 처음 N회 호출은 ConnectionError를 발생시킨다 (재시도 확인용).
+    """
+
+    def __init__(
+        self,
+        reply: str = "retrieve",
+        responder: Callable[[str], str] | None = None,
+        latency: float = 0.0,
+        failures: int = 0,
+    ):
+        self.reply = reply
+        self.responder = responder
+        self.latency = latency
+        self.failures = failures
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt: str) -> AIMessage:
+        with self._lock:
+            self.calls += 1
+            fail = self.calls <= self.failures
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            raise ConnectionError("stub backend failure")
+
+        content = self.responder(prompt) if self.responder else self.reply
+        input_tokens = estimate_tokens(prompt)
+        output_tokens = estimate_tokens(content)
+        return AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        )
+
 
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+class LLMDispatcher:
+    """모든 노드가 공유하는 LLM 호출 스케줄러.
+
+    분당 요청 수(RPM)와 분당 토큰 수(TPM)를 토큰 버킷으로 제한하고, 대기 중인 호출은
+    우선순위 순(같은 우선순위는 도착 순)으로 내보낸다. 레이트 리밋 등 일시적 오류는
+    지터가 섞인 지수 백오프로 재시도한다.
+    """
+
+    def __init__(
+        self,
+        backend: Any,
+        rpm: int = 500,
+        tpm: int = 200_000,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+    ):
+        self.backend = backend
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self._cond = threading.Condition()
+        self._waiting: list[tuple[int, int]] = []  # (priority, seq) 힙
+        self._seq = itertools.count()
+        self._requests = TokenBucket(rpm)
+        self._tokens = TokenBucket(tpm)
+
+        self._in_flight = 0
+        self._granted = 0
+        self._completed = 0
+        self._retries = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def configure(self, rpm: int | None = None, tpm: int | None = None):
+        """RPM/TPM 한도를 변경한다 (남은 양은 기존 비율대로 유지)."""
+        with self._cond:
+            if rpm is not None:
+                self._requests = self._resized(self._requests, rpm)
+            if tpm is not None:
+                self._tokens = self._resized(self._tokens, tpm)
+            self._cond.notify_all()
+
+    @staticmethod
+    def _resized(bucket: TokenBucket, per_minute: int) -> TokenBucket:
+        # 한도 변경 때마다 버킷이 가득 차 순간적으로 한도를 넘지 않도록 채움 비율을 유지
+        resized = TokenBucket(per_minute)
+        bucket.refill(time.monotonic())
+        resized.tokens = bucket.tokens / bucket.capacity * resized.capacity
+        return resized
+
+    def invoke(
+        self,
+        prompt: str,
+        priority: int = PRIORITY_GENERATION,
+        expected_output_tokens: int = 256,
+    ) -> AIMessage:
+        """한도 내에서 차례가 오면 LLM을 호출하고 응답을 반환한다."""
+        estimate = estimate_tokens(prompt) + expected_output_tokens
+
+        for attempt in range(self.max_retries + 1):
+            self._acquire(priority, estimate)
+            try:
+                response = self.backend.invoke(prompt)
+            except RETRYABLE_ERRORS:
+                if attempt == self.max_retries:
+                    raise
+                with self._cond:
+                    self._retries += 1
+                # full jitter: [0, backoff * 2^attempt)
+                time.sleep(random.uniform(0, self.backoff * (2**attempt)))
+                continue
+            finally:
+                with self._cond:
+                    self._in_flight -= 1
+
+            # 추정치와 실제 토큰 사용량의 차이를 정산
+            usage = getattr(response, "usage_metadata", None) or {}
+            with self._cond:
+                self._completed += 1
+                if usage.get("total_tokens"):
+                    self._tokens.consume(usage["total_tokens"] - estimate)
+                    self._cond.notify_all()
+            return response
+
+        raise RuntimeError("unreachable")
+
+    def _acquire(self, priority: int, tokens: int):
+        entry = (priority, next(self._seq))
+        start = time.monotonic()
+
+        with self._cond:
+            heapq.heappush(self._waiting, entry)
+            try:
+                while True:
+                    if self._waiting[0] != entry:
+                        self._cond.wait()
+                        continue
+                    now = time.monotonic()
+                    wait = max(
+                        self._requests.wait_time(1, now),
+                        self._tokens.wait_time(tokens, now),
+                    )
+                    if wait <= 0:
+                        self._requests.consume(1)
+                        self._tokens.consume(tokens)
+                        break
+                    self._cond.wait(wait)
+            finally:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+
+            waited = time.monotonic() - start
+            self._in_flight += 1
+            self._granted += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+    def stats(self) -> dict[str, Any]:
+        """대기열 길이, 대기 시간 등 현재 상태를 반환한다."""
+        with self._cond:
+            now = time.monotonic()
+            self._requests.refill(now)
+            self._tokens.refill(now)
+            by_priority: dict[int, int] = {}
+            for priority, _ in self._waiting:
+                by_priority[priority] = by_priority.get(priority, 0) + 1
+            return {
+                "queue_depth": len(self._waiting),
+                "queue_depth_by_priority": by_priority,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "retries": self._retries,
+                "avg_wait_ms": (
+                    round(self._wait_total / self._granted * 1000, 1)
+                    if self._granted
+                    else 0.0
+                ),
+                "max_wait_ms": round(self._wait_max * 1000, 1),
+                "rpm_limit": int(self._requests.capacity),
+                "tpm_limit": int(self._tokens.capacity),
+                "requests_available": int(self._requests.tokens),
+                "tokens_available": int(self._tokens.tokens),
+            }
+
+
+def build_llm_backend() -> Any:
+    """LLM_BACKEND 환경 변수에 따라 LLM 백엔드를 생성한다 ('openai' 또는 'stub')."""
+    if os.getenv("LLM_BACKEND", "openai") == "stub":
+        return StubChatModel()
+    # 재시도는 디스패처가 담당한다
+    return ChatOpenAI(model="gpt-4o-mini", temperature=0, max_retries=0)
+
+
+llm = build_llm_backend()
+dispatcher = LLMDispatcher(
+    llm,
+    rpm=int(os.getenv("LLM_RPM", "500")),
+    tpm=int(os.getenv("LLM_TPM", "200000")),
+)
+
+
+_collection_lock = threading.Lock()
+_collection_cache: dict[str, Any] = {
+    "version": None,
+    "path": None,
+    "collection": None,
+    "checked": 0.0,
+}
+# 스냅샷 경로 -> 해당 스냅샷을 연 클라이언트 (교체 후 해제할 때 사용)
+_clients: dict[str, Any] = {}
+# 해제 대기 중인 스냅샷 경로 -> 타이머 (롤백으로 다시 현재 버전이 되면 취소)
+_pending_releases: dict[str, threading.Timer] = {}
 
 
 def get_collection() -> chromadb.Collection:
-    """ChromaDB 컬렉션을 가져온다."""
-    client = chromadb.PersistentClient(path=str(CHROMA_DIR))
-    return client.get_collection(name=COLLECTION_NAME)
+    """현재 서비스 중인 인덱스 버전의 ChromaDB 컬렉션을 가져온다.
+
+    INDEX_RELOAD_INTERVAL초마다 버전 포인터를 확인하여, 새 버전이 승격(또는 롤백)되면
+    재시작 없이 해당 스냅샷으로 전환한다.
+    """
+    now = time.monotonic()
+    with _collection_lock:
+        cache = _collection_cache
+        if cache["collection"] is not None and now - cache["checked"] < INDEX_RELOAD_INTERVAL:
+            return cache["collection"]
+        cache["checked"] = now
+
+        version, path = current_index_dir()
+        if cache["collection"] is None or version != cache["version"]:
+            client = chromadb.PersistentClient(path=str(path))
+            collection = client.get_collection(name=COLLECTION_NAME)
+            _clients[str(path)] = client
+            pending = _pending_releases.pop(str(path), None)
+            if pending is not None:
+                pending.cancel()
+            if cache["collection"] is not None:
+                print(f"인덱스 버전 전환: {cache['version']} -> {version}")
+                _release_index_later(cache["path"])
+            cache.update(version=version, path=path, collection=collection)
+        return cache["collection"]
+
+
+def _release_index_later(path: Path, delay: float = 60.0):
+    """교체된 스냅샷의 Chroma 시스템을 진행 중인 요청이 끝난 뒤 해제한다.
+
+    호출자가 _collection_lock을 잡은 상태여야 한다.
+    """
+    key = str(path)
+
+    def release():
+        with _collection_lock:
+            if _pending_releases.get(key) is not timer:
+                return
+            del _pending_releases[key]
+            # 대기 중에 롤백으로 다시 현재 버전이 되었다면 해제하지 않는다
+            if str(_collection_cache["path"]) == key:
+                return
+            client = _clients.pop(key, None)
+            if client is None:
+                print(f"인덱스 스냅샷 해제 실패 ({key}): 클라이언트를 찾을 수 없습니다.")
+                return
+            try:
+                _close_client(client)
+            except Exception as e:
+                print(f"인덱스 스냅샷 해제 실패 ({key}): {e!r}")
+
+    previous = _pending_releases.get(key)
+    if previous is not None:
+        previous.cancel()
+    timer = threading.Timer(delay, release)
+    timer.daemon = True
+    _pending_releases[key] = timer
+    timer.start()
+
+
+def _close_client(client: Any):
+    """스냅샷 클라이언트가 잡고 있는 Chroma 시스템(SQLite 핸들, 세그먼트)을 닫는다."""
+    close = getattr(client, "close", None)
+    if callable(close):
+        close()
+        return
+
+    # close()가 없는 버전: 같은 경로의 클라이언트들이 공유하는 시스템을 직접 정지한다.
+    # 공유 캐시 키는 chromadb가 설정에서 계산하므로 경로 문자열을 가정하지 않는다
+    from chromadb.api.shared_system_client import SharedSystemClient
+
+    identifier = SharedSystemClient._get_identifier_from_settings(client.get_settings())
+    system = SharedSystemClient._identifier_to_system.pop(identifier, None)
+    if system is None:
+        raise RuntimeError(f"공유 Chroma 시스템을 찾을 수 없습니다 (key={identifier!r})")
+    system.stop()
+
+
+def _reset_collection_cache():
+    # fork된 자식 프로세스는 부모의 Chroma 클라이언트를 재사용하지 않는다
+    global _collection_lock
+    _collection_lock = threading.Lock()
+    _collection_cache.update(version=None, path=None, collection=None, checked=0.0)
+    _clients.clear()
+    _pending_releases.clear()
+
+
+os.register_at_fork(after_in_child=_reset_collection_cache)
+
+
+def hydrate_documents(
+    refs: list[DocRef],
+    include_content: bool = True,
+) -> list[dict[str, Any]]:
+    """문서 참조를 벡터 DB에서 불러와 본문/메타데이터를 채운다.
+
+    Args:
+        refs: 문서 참조 리스트.
+        include_content: False이면 메타데이터만 불러온다.
+
+    Returns:
+        refs 순서를 유지한 {"id", "content", "metadata", "distance"} 리스트.
+    """
+    if not refs:
+        return []
+
+    include = ["metadatas", "documents"] if include_content else ["metadatas"]
+    result = get_collection().get(ids=[ref.id for ref in refs], include=include)
+    position = {doc_id: i for i, doc_id in enumerate(result["ids"])}
 
+    documents = []
+    for ref in refs:
+        i = position.get(ref.id)
+        if i is None:
+            continue
+        documents.append({
+            "id": ref.id,
+            "content": result["documents"][i] if include_content else "",
+            "metadata": result["metadatas"][i] or {},
+            "distance": ref.distance,
+        })
+    return documents
 
-# ── Router Node ──────────────────────────────────────────────────────────────
 
-def router_node(state: AgentState) -> AgentState:
-    """질문이 논문 검색이 필요한지, 일반 대화인지 판단한다."""
-    question = state["question"]
+# ── Router Node ──────────────────────────────────────────────────────────────
 
+def classify_route(question: str) -> str:
+    """LLM으로 질문을 'retrieve' 또는 'chat'으로 분류한다."""
     prompt = f"""다음 사용자 질문을 분석하여, 학술 논문 검색이 필요한 질문인지 판단하세요.
 
 질문: {question}
@@ -41,29 +450,48 @@ def router_node(state: AgentState) -> AgentState:
 
 반드시 "retrieve" 또는 "chat" 중 하나만 출력하세요."""
 
-    response = llm.invoke(prompt)
+    response = dispatcher.invoke(
+        prompt, priority=PRIORITY_INTERACTIVE, expected_output_tokens=5
+    )
     route = response.content.strip().lower()
 
     if "retrieve" in route:
-        route = "retrieve"
-    else:
-        route = "chat"
+        return "retrieve"
+    return "chat"
 
-    return {
-        **state,
-        "route": route,
-        "steps": state.get("steps", []) + [f"Router: {route}"],
-    }
+
+def router_node(state: AgentState) -> dict[str, Any]:
+    """질문이 논문 검색이 필요한지, 일반 대화인지 판단한다."""
+    route = classify_route(state["question"])
+    return {"route": route, "steps": [f"Router: {route}"]}
 
 
 # ── Retriever Node ───────────────────────────────────────────────────────────
 
-def retriever_node(state: AgentState) -> AgentState:
-    """질문에서 키워드와 필터를 추출하고 벡터 검색을 수행한다."""
-    question = state["question"]
+def extract_search_queries(
+    question: str,
+    num_variants: int = MULTI_QUERY_VARIANTS,
+) -> tuple[list[str], str | None]:
+    """LLM으로 질문에서 검색어(변형 포함)와 연도 필터를 추출한다.
+
+    num_variants가 2 이상이면 관점/표현이 다른 영어 검색어를 여러 개 요청한다.
+    """
+    if num_variants > 1:
+        query_lines = "\n".join(
+            f"검색어{i}: <벡터 검색에 사용할 영어 검색 쿼리 (변형 {i})>"
+            for i in range(1, num_variants + 1)
+        )
+        extract_prompt = f"""다음 질문에서 학술 논문 검색에 사용할 정보를 추출하세요.
+검색 재현율을 높이기 위해 서로 다른 표현(동의어, 상위/하위 개념, 핵심 키워드 나열 등)으로
+영어 검색 쿼리 {num_variants}개를 작성하세요.
 
-    # LLM으로 검색 키워드 및 필터 추출
-    extract_prompt = f"""다음 질문에서 학술 논문 검색에 사용할 정보를 추출하세요.
+질문: {question}
+
+다음 형식으로 응답하세요:
+{query_lines}
+연도필터: <특정 연도가 언급되면 해당 연도, 없으면 "없음">"""
+    else:
+        extract_prompt = f"""다음 질문에서 학술 논문 검색에 사용할 정보를 추출하세요.
 
 질문: {question}
 
@@ -71,73 +499,262 @@ def retriever_node(state: AgentState) -> AgentState:
 검색어: <벡터 검색에 사용할 영어 검색 쿼리>
 연도필터: <특정 연도가 언급되면 해당 연도, 없으면 "없음">"""
 
-    response = llm.invoke(extract_prompt)
+    response = dispatcher.invoke(
+        extract_prompt,
+        priority=PRIORITY_INTERACTIVE,
+        expected_output_tokens=50 * num_variants,
+    )
     lines = response.content.strip().split("\n")
 
-    search_query = question
+    search_queries = []
     year_filter = None
 
     for line in lines:
-        if line.startswith("검색어:"):
-            search_query = line.replace("검색어:", "").strip()
+        line = line.strip()
+        if line.startswith("검색어") and ":" in line:
+            label, query = line.split(":", 1)
+            query = query.strip()
+            if label[3:].strip().isdigit() or label == "검색어":
+                if query and query not in search_queries:
+                    search_queries.append(query)
         elif line.startswith("연도필터:"):
             year_val = line.replace("연도필터:", "").strip()
             if year_val != "없음" and year_val.isdigit():
                 year_filter = year_val
 
-    filters = {"year": year_filter} if year_filter else {}
-
-    # ChromaDB 벡터 검색
+    return search_queries[:num_variants] or [question], year_filter
+
+
+def fuse_results(
+    id_lists: list[list[str]],
+    distance_lists: list[list[float]] | None,
+    n_results: int,
+    k: int = RRF_K,
+) -> list[DocRef]:
+    """여러 검색 결과를 Reciprocal Rank Fusion으로 합치고 id 기준으로 중복을 제거한다.
+
+    각 문서의 거리는 여러 검색 결과 중 가장 가까운 값을 유지한다.
+    """
+    scores: dict[str, float] = {}
+    best_distance: dict[str, float] = {}
+
+    for q, ids in enumerate(id_lists):
+        distances = distance_lists[q] if distance_lists else None
+        for rank, doc_id in enumerate(ids):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+            if distances is not None:
+                distance = distances[rank]
+                if doc_id not in best_distance or distance < best_distance[doc_id]:
+                    best_distance[doc_id] = distance
+
+    ranked = sorted(scores, key=scores.__getitem__, reverse=True)[:n_results]
+    return [DocRef(doc_id, best_distance.get(doc_id)) for doc_id in ranked]
+
+
+def _metadata_matches(meta: dict, category: str | None, author: str | None) -> bool:
+    if category:
+        categories = [c.strip().lower() for c in meta.get("categories", "").split(",")]
+        if category.strip().lower() not in categories:
+            return False
+    if author and author.strip().lower() not in meta.get("authors", "").lower():
+        return False
+    return True
+
+
+def query_index(
+    embeddings: np.ndarray,
+    n_results: int,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    category: str | None = None,
+    author: str | None = None,
+) -> tuple[list[list[str]], list[list[float]]]:
+    """필터를 만족하는 문서 중 질의 임베딩별 상위 n_results개 (id 목록, 코사인 거리 목록)을 반환한다.
+
+    스냅샷의 mmap 벡터 인덱스(워커 간 공유)로 검색하며, 필터는 순위 계산 전에 적용되므로
+    결과는 항상 정확하다. 벡터 인덱스가 없는 이전 스냅샷에서만 ChromaDB HNSW 검색을
+    사용한다.
+    """
+    index = get_vector_index()
+    if index is not None:
+        mask = index.filter_mask(year_from, year_to, category, author)
+        return index.search(embeddings, n_results, mask)
+
+    conditions = []
+    if year_from is not None:
+        # ChromaDB 범위 연산자는 숫자만 지원하므로 정수 year 필드로 필터링
+        conditions.append({"year": {"$gte": year_from}})
+    if year_to is not None:
+        conditions.append({"year": {"$lte": year_to}})
+    where = None
+    if len(conditions) == 1:
+        where = conditions[0]
+    elif conditions:
+        where = {"$and": conditions}
+
+    # 카테고리/저자는 Chroma where로 표현할 수 없으므로 전체 순위를 받아 걸러낸다
+    post_filter = bool(category or author)
     collection = get_collection()
-
-    where_filter = None
-    if year_filter:
-        where_filter = {
-            "published": {"$gte": f"{year_filter}-01-01"},
-        }
-
     results = collection.query(
-        query_texts=[search_query],
-        n_results=20,
-        where=where_filter if where_filter else None,
+        query_embeddings=np.asarray(embeddings).tolist(),
+        n_results=collection.count() if post_filter else n_results,
+        where=where,
+        include=["distances", "metadatas"] if post_filter else ["distances"],
+    )
+    if not results or not results["ids"]:
+        return [[] for _ in embeddings], [[] for _ in embeddings]
+    if not post_filter:
+        return results["ids"], results["distances"]
+
+    id_lists, distance_lists = [], []
+    for ids, distances, metadatas in zip(
+        results["ids"], results["distances"], results["metadatas"]
+    ):
+        kept = [
+            (doc_id, distance)
+            for doc_id, distance, meta in zip(ids, distances, metadatas)
+            if _metadata_matches(meta or {}, category, author)
+        ][:n_results]
+        id_lists.append([doc_id for doc_id, _ in kept])
+        distance_lists.append([distance for _, distance in kept])
+    return id_lists, distance_lists
+
+
+def search_papers(
+    search_queries: list[str],
+    year_filter: str | None = None,
+    n_results: int = 20,
+) -> list[DocRef]:
+    """벡터 검색을 수행하고 문서 참조 리스트를 반환한다.
+
+    검색어가 여러 개이면 한 번에 일괄 임베딩/검색한 뒤 결과를 융합한다.
+    본문/메타데이터는 필요한 노드에서 불러오므로 id와 거리만 조회한다.
+    """
+    embeddings = embed_texts(search_queries)
+    ids, distances = query_index(
+        embeddings,
+        n_results,
+        year_from=int(year_filter) if year_filter else None,
     )
+    return fuse_results(ids, distances, n_results)
 
-    documents = []
-    if results and results["documents"]:
-        for i, doc in enumerate(results["documents"][0]):
-            meta = results["metadatas"][0][i] if results["metadatas"] else {}
-            distance = results["distances"][0][i] if results["distances"] else None
-            documents.append({
-                "content": doc,
-                "metadata": meta,
-                "distance": distance,
-            })
+
+def retriever_node(state: AgentState) -> dict[str, Any]:
+    """질문에서 키워드와 필터를 추출하고 벡터 검색을 수행한다."""
+    search_queries, year_filter = extract_search_queries(state["question"])
+    documents = search_papers(search_queries, year_filter)
+
+    return {
+        "documents": documents,
+        "filters": {"year": year_filter} if year_filter else {},
+        "steps": [
+            f"Retriever: '{' | '.join(search_queries)}' -> {len(documents)}개 문서 검색"
+        ],
+    }
+
+
+# ── Speculative Router Node ──────────────────────────────────────────────────
+
+_speculation_pool: ThreadPoolExecutor | None = None
+_speculation_lock = threading.Lock()
+
+
+def _get_speculation_pool() -> ThreadPoolExecutor:
+    global _speculation_pool
+    with _speculation_lock:
+        if _speculation_pool is None:
+            _speculation_pool = ThreadPoolExecutor(
+                max_workers=int(os.getenv("SPECULATION_WORKERS", "8")),
+                thread_name_prefix="speculate",
+            )
+        return _speculation_pool
+
+
+def _reset_speculation_pool():
+    # fork된 자식 프로세스에는 부모의 스레드가 없으므로 풀을 새로 만든다
+    global _speculation_pool, _speculation_lock
+    _speculation_pool = None
+    _speculation_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_speculation_pool)
+
+
+def _extract_and_search(question: str) -> tuple[list[str], str | None, list[DocRef]]:
+    search_queries, year_filter = extract_search_queries(question)
+    return search_queries, year_filter, search_papers(search_queries, year_filter)
+
+
+def speculative_router_node(state: AgentState) -> dict[str, Any]:
+    """라우팅과 동시에 검색어 추출 및 질문 원문 벡터 검색을 미리 실행한다.
+
+    route가 'retrieve'이면 미리 실행한 검색 결과를 바로 상태에 채워 Retriever 단계를
+    건너뛰고, 'chat'이면 아직 시작하지 않은 작업은 취소하고 진행 중인 결과는 폐기한다.
+    검색어 추출이 실패하면 질문 원문 검색 결과를 사용한다.
+    """
+    question = state["question"]
+
+    pool = _get_speculation_pool()
+    extracted = pool.submit(_extract_and_search, question)
+    raw = pool.submit(search_papers, [question])
+
+    try:
+        route = classify_route(question)
+    except BaseException:
+        extracted.cancel()
+        raw.cancel()
+        raise
+
+    if route != "retrieve":
+        extracted.cancel()
+        raw.cancel()
+        return {"route": route, "steps": [f"Router: {route} (추측 검색 폐기)"]}
+
+    try:
+        search_queries, year_filter, documents = extracted.result()
+        raw.cancel()
+    except Exception as e:
+        print(f"추측 검색어 추출 실패, 질문 원문 검색 결과 사용: {e!r}")
+        search_queries, year_filter, documents = [question], None, raw.result()
 
     return {
-        **state,
+        "route": route,
         "documents": documents,
-        "filters": filters,
-        "steps": state.get("steps", [])
-        + [f"Retriever: '{search_query}' -> {len(documents)}개 문서 검색"],
+        "filters": {"year": year_filter} if year_filter else {},
+        "steps": [
+            f"Router: {route}",
+            f"Retriever(추측 실행): '{' | '.join(search_queries)}' "
+            f"-> {len(documents)}개 문서 검색",
+        ],
     }
 
 
 # ── Reranker Node ────────────────────────────────────────────────────────────
 
-def reranker_node(state: AgentState) -> AgentState:
+def reranker_node(state: AgentState) -> dict[str, Any]:
     """검색된 문서 중 질문과 가장 관련 있는 Top-5를 선정한다."""
     question = state["question"]
     documents = state["documents"]
 
     if not documents:
+        return {"steps": ["Reranker: 검색 결과 없음"]}
+
+    # 부하 시 LLM 재순위화를 생략하고 벡터 거리순 상위 5편 사용
+    if state.get("degrade_level", DEGRADE_NONE) >= DEGRADE_SKIP_RERANK:
+        by_distance = sorted(
+            documents,
+            key=lambda doc: doc.distance if doc.distance is not None else float("inf"),
+        )
         return {
-            **state,
-            "steps": state.get("steps", []) + ["Reranker: 검색 결과 없음"],
+            "documents": by_distance[:5],
+            "steps": ["Reranker: 부하로 생략, 거리순 상위 5편 선정"],
         }
 
-    # 문서 요약 리스트 생성
+    # 문서 요약 리스트 생성 (인덱스가 어긋나지 않도록 불러온 문서 기준으로 참조 재구성)
+    hydrated = hydrate_documents(documents[:20])
+    documents = [DocRef(doc["id"], doc["distance"]) for doc in hydrated]
     doc_summaries = []
-    for i, doc in enumerate(documents[:20]):
+    for i, doc in enumerate(hydrated):
         title = doc["metadata"].get("title", "N/A")
         doc_summaries.append(f"[{i}] {title}\n{doc['content'][:300]}")
 
@@ -157,7 +774,9 @@ def reranker_node(state: AgentState) -> AgentState:
 순위 4: [인덱스] - 선정 이유 (한 줄)
 순위 5: [인덱스] - 선정 이유 (한 줄)"""
 
-    response = llm.invoke(rerank_prompt)
+    response = dispatcher.invoke(
+        rerank_prompt, priority=PRIORITY_GENERATION, expected_output_tokens=300
+    )
     rerank_text = response.content.strip()
 
     # 선택된 인덱스 파싱
@@ -183,30 +802,36 @@ def reranker_node(state: AgentState) -> AgentState:
         reranked = documents[:5]
 
     return {
-        **state,
         "documents": reranked,
-        "steps": state.get("steps", [])
-        + [f"Reranker: {len(reranked)}개 논문 선정\n{rerank_text}"],
+        "steps": [f"Reranker: {len(reranked)}개 논문 선정\n{rerank_text}"],
     }
 
 
 # ── Generator Node ───────────────────────────────────────────────────────────
 
-def generator_node(state: AgentState) -> AgentState:
+def generator_node(state: AgentState) -> dict[str, Any]:
     """논문 리스트를 바탕으로 최종 답변을 생성한다."""
     question = state["question"]
     documents = state["documents"]
 
     if not documents:
         return {
-            **state,
             "generation": "검색된 관련 논문이 없습니다. 다른 키워드로 질문해 주세요.",
-            "steps": state.get("steps", []) + ["Generator: 문서 없음"],
+            "steps": ["Generator: 문서 없음"],
+        }
+
+    degrade_level = state.get("degrade_level", DEGRADE_NONE)
+    if degrade_level >= DEGRADE_RETRIEVAL_ONLY:
+        hydrated = hydrate_documents(documents, include_content=False)
+        return {
+            "generation": _retrieval_only_answer(hydrated),
+            "steps": ["Generator: 부하로 생략, 검색 결과만 반환"],
         }
 
-    # 문서 컨텍스트 구성
+    # 문서 컨텍스트 구성 (부하 시 문서 수와 본문 길이를 줄임)
+    max_docs, max_chars = (3, 200) if degrade_level >= DEGRADE_SHORT_CONTEXT else (5, 500)
     context_parts = []
-    for i, doc in enumerate(documents, 1):
+    for i, doc in enumerate(hydrate_documents(documents[:max_docs]), 1):
         meta = doc["metadata"]
         title = meta.get("title", "N/A")
         url = meta.get("url", "N/A")
@@ -217,7 +842,7 @@ def generator_node(state: AgentState) -> AgentState:
             f"    저자: {authors}\n"
             f"    발행일: {published}\n"
             f"    링크: {url}\n"
-            f"    내용: {doc['content'][:500]}"
+            f"    내용: {doc['content'][:max_chars]}"
         )
 
     context = "\n\n".join(context_parts)
@@ -235,18 +860,31 @@ def generator_node(state: AgentState) -> AgentState:
 3. 답변 마지막에 참고 논문 목록을 링크와 함께 제공하세요.
 4. 한국어로 답변하세요."""
 
-    response = llm.invoke(gen_prompt)
+    response = dispatcher.invoke(
+        gen_prompt, priority=PRIORITY_GENERATION, expected_output_tokens=1024
+    )
 
     return {
-        **state,
         "generation": response.content,
-        "steps": state.get("steps", []) + ["Generator: 답변 생성 완료"],
+        "steps": ["Generator: 답변 생성 완료"],
     }
 
 
+def _retrieval_only_answer(documents: list[dict[str, Any]]) -> str:
+    """LLM 없이 검색된 논문 목록만으로 답변을 구성한다."""
+    lines = ["현재 요청이 많아 요약 답변 대신 관련 논문 목록을 제공합니다.\n"]
+    for i, doc in enumerate(documents, 1):
+        meta = doc["metadata"]
+        lines.append(
+            f"[{i}] [{meta.get('title', 'N/A')}]({meta.get('url', '')}) "
+            f"- {meta.get('authors', 'N/A')} ({meta.get('published', 'N/A')[:10]})"
+        )
+    return "\n".join(lines)
+
+
 # ── Chat Node (일반 대화) ────────────────────────────────────────────────────
 
-def chat_node(state: AgentState) -> AgentState:
+def chat_node(state: AgentState) -> dict[str, Any]:
     """일반 대화에 대한 응답을 생성한다."""
     question = state["question"]
 
@@ -257,10 +895,11 @@ def chat_node(state: AgentState) -> AgentState:
 
 사용자: {question}"""
 
-    response = llm.invoke(prompt)
+    response = dispatcher.invoke(
+        prompt, priority=PRIORITY_INTERACTIVE, expected_output_tokens=200
+    )
 
     return {
-        **state,
         "generation": response.content,
-        "steps": state.get("steps", []) + ["Chat: 일반 대화 응답"],
+        "steps": ["Chat: 일반 대화 응답"],
     }
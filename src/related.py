@@ -0,0 +1,245 @@
+"""관련 논문 kNN 그래프 모듈.
+
+인덱싱 시 전체 논문 임베딩에 대해 top-k 최근접 이웃 그래프를 블록 단위 행렬곱으로
+미리 계산하고, CSR 배열(indptr, indices, scores)로 스냅샷 디렉터리에 저장한다.
+`/papers/{id}/similar` 요청은 LLM/벡터 검색 없이 이 그래프만 조회한다.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.index_versions import current_index_dir
+
+KNN_FILENAME = "knn.npz"
+DEFAULT_K = 10
+BLOCK_SIZE = 1024
+
+
+def _normalize(embeddings: np.ndarray) -> np.ndarray:
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
+
+def _topk_rows(
+    queries: np.ndarray,
+    corpus: np.ndarray,
+    k: int,
+    offset: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """queries(행 offset부터 시작)에 대해 corpus 내 top-k 이웃을 블록 단위로 계산한다.
+
+    자기 자신은 제외하며, 결과는 유사도 내림차순으로 정렬된다.
+    """
+    n = len(queries)
+    k = min(k, len(corpus) - 1)
+    indices = np.empty((n, max(k, 0)), dtype=np.int32)
+    scores = np.empty((n, max(k, 0)), dtype=np.float32)
+    if k <= 0:
+        return indices, scores
+
+    for start in range(0, n, BLOCK_SIZE):
+        block = queries[start : start + BLOCK_SIZE]
+        sims = block @ corpus.T  # 코사인 유사도 (정규화된 벡터)
+
+        rows = np.arange(len(block))
+        self_cols = offset + start + rows
+        in_corpus = self_cols < len(corpus)
+        sims[rows[in_corpus], self_cols[in_corpus]] = -np.inf
+
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        indices[start : start + len(block)] = np.take_along_axis(top, order, axis=1)
+        scores[start : start + len(block)] = np.take_along_axis(top_scores, order, axis=1)
+
+    return indices, scores
+
+
+class KnnGraph:
+    """CSR 형식의 관련 논문 그래프.
+
+    Attributes:
+        ids: 행 번호 -> 논문 id.
+        titles: 행 번호 -> 논문 제목.
+        urls: 행 번호 -> 논문 링크.
+        indptr: 행 i의 이웃은 indices[indptr[i]:indptr[i + 1]].
+        indices: 이웃 행 번호 (유사도 내림차순).
+        scores: 이웃과의 코사인 유사도.
+    """
+
+    __slots__ = ("ids", "titles", "urls", "indptr", "indices", "scores", "_row")
+
+    def __init__(self, ids, titles, urls, indptr, indices, scores):
+        self.ids = np.asarray(ids, dtype=object)
+        self.titles = np.asarray(titles, dtype=object)
+        self.urls = np.asarray(urls, dtype=object)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.scores = np.asarray(scores, dtype=np.float32)
+        self._row = {}
+        for row, paper_id in enumerate(self.ids):
+            self._row[paper_id] = row
+            # "http://arxiv.org/abs/2401.12345v1" 외에 "2401.12345v1"로도 조회 가능
+            self._row.setdefault(paper_id.rsplit("/abs/", 1)[-1], row)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_dense(cls, ids, titles, urls, indices, scores) -> "KnnGraph":
+        k = indices.shape[1]
+        indptr = np.arange(len(ids) + 1, dtype=np.int64) * k
+        return cls(ids, titles, urls, indptr, indices.reshape(-1), scores.reshape(-1))
+
+    def neighbors(self, paper_id: str, limit: int | None = None) -> list[dict]:
+        """논문의 관련 논문 목록을 반환한다 (없는 id면 KeyError)."""
+        row = self._row[paper_id]
+        start, end = self.indptr[row], self.indptr[row + 1]
+        if limit is not None:
+            end = min(end, start + limit)
+        return [
+            {
+                "id": self.ids[col],
+                "title": self.titles[col],
+                "url": self.urls[col],
+                "score": round(float(score), 4),
+            }
+            for col, score in zip(self.indices[start:end], self.scores[start:end])
+        ]
+
+    def save(self, path: Path):
+        tmp_path = path.with_suffix(".tmp.npz")
+        np.savez(
+            tmp_path,
+            ids=self.ids.astype(str),
+            titles=self.titles.astype(str),
+            urls=self.urls.astype(str),
+            indptr=self.indptr,
+            indices=self.indices,
+            scores=self.scores,
+        )
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "KnnGraph":
+        with np.load(path) as data:
+            return cls(
+                data["ids"].tolist(),
+                data["titles"].tolist(),
+                data["urls"].tolist(),
+                data["indptr"],
+                data["indices"],
+                data["scores"],
+            )
+
+
+def build_knn_graph(
+    ids: list[str],
+    embeddings: np.ndarray,
+    titles: list[str],
+    urls: list[str],
+    k: int = DEFAULT_K,
+    previous: KnnGraph | None = None,
+) -> KnnGraph:
+    """전체 논문 임베딩으로 top-k 관련 논문 그래프를 만든다.
+
+    previous가 주어지면 증분 계산한다. 새로 추가된 논문과 삭제된 논문을 이웃으로
+    가지고 있던 논문만 전체 대비 다시 계산하고, 나머지 기존 논문은 새 논문이 현재
+    k번째 이웃보다 가까울 때만 갱신한다. 결과는 전체 재계산과 같다.
+    """
+    corpus = _normalize(embeddings)
+    position = {paper_id: i for i, paper_id in enumerate(ids)}
+    k = min(k, len(ids) - 1)
+
+    incremental = (
+        previous is not None
+        and len(previous) > 0
+        and k > 0
+        and previous.indices.size == len(previous) * k
+    )
+    if incremental:
+        # 이전 행 번호 -> 새 행 번호 (삭제된 논문은 -1)
+        remap = np.array(
+            [position.get(paper_id, -1) for paper_id in previous.ids], dtype=np.int32
+        )
+        incremental = bool((remap >= 0).any())
+    if not incremental:
+        indices, scores = _topk_rows(corpus, corpus, k, offset=0)
+        return KnnGraph.from_dense(ids, titles, urls, indices, scores)
+
+    # 남아 있는 기존 행을 새 행 번호 체계로 옮긴다
+    kept = remap >= 0
+    old_rows = remap[kept]
+    old_indices = remap[previous.indices.reshape(len(previous), k)[kept]]
+    old_scores = previous.scores.reshape(len(previous), k)[kept]
+
+    indices = np.empty((len(ids), k), dtype=np.int32)
+    scores = np.empty((len(ids), k), dtype=np.float32)
+    indices[old_rows] = old_indices
+    scores[old_rows] = old_scores
+
+    # 삭제된 논문을 이웃으로 가졌던 기존 논문은 다시 계산한다
+    lost_neighbor = (old_indices < 0).any(axis=1)
+    clean_rows = old_rows[~lost_neighbor]
+    new_mask = np.ones(len(ids), dtype=bool)
+    new_mask[old_rows] = False
+    new_rows = np.flatnonzero(new_mask)
+    recompute_rows = np.concatenate([new_rows, old_rows[lost_neighbor]])
+
+    if len(recompute_rows):
+        # 재계산 대상을 앞에 두어 _topk_rows가 자기 자신을 제외하게 한다
+        order = np.concatenate([recompute_rows, clean_rows])
+        reordered = corpus[order]
+        top_idx, top_scores = _topk_rows(
+            reordered[: len(recompute_rows)], reordered, k, offset=0
+        )
+        indices[recompute_rows] = order[top_idx]
+        scores[recompute_rows] = top_scores
+
+    if len(new_rows):
+        # 나머지 기존 논문: 새 논문과의 유사도가 현재 k번째 이웃보다 크면 병합
+        for start in range(0, len(clean_rows), BLOCK_SIZE):
+            rows = clean_rows[start : start + BLOCK_SIZE]
+            sims = corpus[rows] @ corpus[new_rows].T
+            improves = (sims > scores[rows, -1:]).any(axis=1)
+            for row, row_sims in zip(rows[improves], sims[improves]):
+                cand_idx = np.concatenate([indices[row], new_rows])
+                cand_scores = np.concatenate([scores[row], row_sims])
+                top = np.argsort(-cand_scores, kind="stable")[:k]
+                indices[row] = cand_idx[top]
+                scores[row] = cand_scores[top]
+
+    print(
+        f"  kNN 증분 갱신: 추가 {len(new_rows)}편, 삭제 {int((~kept).sum())}편, "
+        f"재계산 {len(recompute_rows)}편 / 전체 {len(ids)}편"
+    )
+    return KnnGraph.from_dense(ids, titles, urls, indices, scores)
+
+
+_graph_lock = threading.Lock()
+_graph_cache: dict = {"version": None, "graph": None, "checked": 0.0}
+GRAPH_RELOAD_INTERVAL = float(os.getenv("INDEX_RELOAD_INTERVAL", "1.0"))
+
+
+def get_related_graph() -> KnnGraph | None:
+    """현재 서비스 중인 인덱스 버전의 관련 논문 그래프를 반환한다 (없으면 None).
+
+    인덱스 버전이 바뀌면 해당 스냅샷의 그래프를 새로 불러온다.
+    """
+    now = time.monotonic()
+    with _graph_lock:
+        if now - _graph_cache["checked"] < GRAPH_RELOAD_INTERVAL:
+            return _graph_cache["graph"]
+        _graph_cache["checked"] = now
+
+        version, path = current_index_dir()
+        if version != _graph_cache["version"] or _graph_cache["graph"] is None:
+            knn_path = path / KNN_FILENAME
+            graph = KnnGraph.load(knn_path) if knn_path.exists() else None
+            _graph_cache.update(version=version, graph=graph)
+        return _graph_cache["graph"]
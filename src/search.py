@@ -0,0 +1,89 @@
+"""LLM 호출 없는 저지연 벡터 검색 모듈 (/search 엔드포인트용)."""
+
+import functools
+import os
+import time
+from typing import Any
+
+import numpy as np
+
+from src.embedding_service import embed_texts
+from src.nodes import get_collection, query_index
+
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "4096"))
+
+
+@functools.lru_cache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)
+def _embed_normalized(query: str) -> np.ndarray:
+    embedding = embed_texts([query])[0]
+    embedding.setflags(write=False)
+    return embedding
+
+
+def embed_query(query: str) -> np.ndarray:
+    """질의 임베딩을 반환한다 (LRU 캐시).
+
+    all-MiniLM-L6-v2는 uncased 모델이므로 대소문자/공백을 정규화한 문자열을 키로 쓴다.
+    """
+    return _embed_normalized(" ".join(query.lower().split()))
+
+
+def search_index(
+    query: str,
+    limit: int = 10,
+    offset: int = 0,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    category: str | None = None,
+    author: str | None = None,
+) -> tuple[list[dict[str, Any]], bool, dict[str, float]]:
+    """벡터 검색으로 논문 순위 목록을 반환한다.
+
+    연도/카테고리/저자 필터는 순위 계산 전에 적용되므로, 필터가 드물게 일치해도
+    페이지가 일찍 끝나지 않고 다음 페이지 존재 여부도 정확하다.
+
+    Args:
+        query: 검색 질의.
+        limit: 반환할 결과 수.
+        offset: 건너뛸 결과 수 (페이지네이션).
+        year_from: 이 연도 이후 발행 논문만 (포함).
+        year_to: 이 연도 이전 발행 논문만 (포함).
+        category: arXiv 카테고리 (예: cs.CL).
+        author: 저자 이름 (부분 일치, 대소문자 무시).
+
+    Returns:
+        ([{"id", "metadata", "distance"}], 다음 페이지 존재 여부, 단계별 소요 시간(ms)).
+    """
+    timings = {}
+
+    start = time.perf_counter()
+    embedding = embed_query(query)
+    timings["embed"] = (time.perf_counter() - start) * 1000
+
+    # 다음 페이지 존재 여부를 알기 위해 한 건 더 가져온다
+    start = time.perf_counter()
+    ids, distances = query_index(
+        embedding[None, :],
+        offset + limit + 1,
+        year_from=year_from,
+        year_to=year_to,
+        category=category,
+        author=author,
+    )
+    timings["search"] = (time.perf_counter() - start) * 1000
+
+    has_more = len(ids[0]) > offset + limit
+    page = list(zip(ids[0], distances[0]))[offset : offset + limit]
+
+    # 메타데이터는 반환할 페이지만 조회
+    start = time.perf_counter()
+    page_ids = [doc_id for doc_id, _ in page]
+    found = get_collection().get(ids=page_ids, include=["metadatas"]) if page_ids else None
+    metadatas = dict(zip(found["ids"], found["metadatas"])) if found else {}
+    timings["metadata"] = (time.perf_counter() - start) * 1000
+
+    hits = [
+        {"id": doc_id, "metadata": metadatas.get(doc_id) or {}, "distance": distance}
+        for doc_id, distance in page
+    ]
+    return hits, has_more, timings
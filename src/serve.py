@@ -0,0 +1,376 @@
+"""운영용 멀티 워커 서버 - 부모 프로세스에서 미리 로드한 뒤 워커를 fork한다.
+
+워커 수와 무관하게 인덱스와 임베딩 모델은 한 벌만 메모리에 올린다.
+
+- 벡터 인덱스: 부모가 스냅샷의 임베딩 행렬(`vectors.npy`)을 mmap으로 열고 필터용
+  메타데이터, 관련 논문 kNN 그래프, 앱 모듈/그래프와 함께 불러온 뒤 fork한다. 행렬은
+  파일 매핑이라 모든 워커가 페이지 캐시의 한 사본을 읽고, 나머지는 copy-on-write로
+  공유한다. 워커는 HNSW 인덱스를 조회하지 않으며 ChromaDB는 본문/메타데이터 조회
+  (SQLite)에만 쓴다. 벡터 인덱스가 없는 이전 스냅샷은 워커별 HNSW 검색으로 대체되므로
+  `python -m src.ingestion --build-vectors`로 생성해 둔다.
+- 임베딩 모델: ONNX 세션은 fork 이후 안전하지 않으므로 전용 임베딩 프로세스 하나가
+  모델을 로드하고, 워커는 Unix 소켓으로 질의 임베딩을 요청한다 (src.embedding_service).
+
+LLM RPM/TPM 한도는 계정 단위이므로 살아 있는 워커 수(종료 대기 중인 워커 포함)로 나누어
+배분하며, 워커 수가 바뀌면 모든 워커에 SIGUSR1을 보내 다시 배분한다.
+
+Signals:
+    SIGHUP: 워커 순차 재시작 (새 워커를 띄운 뒤 기존 워커를 graceful 종료).
+    SIGTERM, SIGINT: 모든 워커를 graceful 종료 후 서버 종료.
+    SIGTTIN / SIGTTOU: 워커 수 1 증가 / 감소.
+
+Usage:
+    python -m src.serve --workers 4 --port 8000
+"""
+
+import argparse
+import gc
+import multiprocessing
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def _warm_page_cache(root: Path) -> int:
+    """디렉터리 아래 파일을 읽어 OS 페이지 캐시에 올리고, 읽은 바이트 수를 반환한다."""
+    total = 0
+    if not root.exists():
+        return total
+    for path in root.rglob("*"):
+        if not path.is_file():
+            continue
+        with open(path, "rb") as f:
+            while chunk := f.read(1 << 20):
+                total += len(chunk)
+    return total
+
+
+def preload():
+    """fork 전에 부모 프로세스에서 앱과 인덱스를 미리 불러온다."""
+    start = time.perf_counter()
+
+    # 앱 모듈을 import하면 그래프가 구성되고 LLM 클라이언트가 생성된다
+    import chromadb.utils.embedding_functions  # noqa: F401
+    import src.app  # noqa: F401
+
+    from src.index_versions import current_index_dir
+    from src.related import get_related_graph
+    from src.vector_index import get_vector_index
+
+    # 벡터 인덱스(mmap)와 kNN 그래프는 fork 후 워커가 그대로 공유한다
+    vectors = get_vector_index()
+    related = get_related_graph()
+
+    # 임베딩 행렬과 SQLite 파일을 페이지 캐시에 올려 첫 요청이 디스크를 읽지 않게 한다
+    _, index_dir = current_index_dir()
+    index_bytes = _warm_page_cache(index_dir)
+
+    # 이후 GC가 공유 페이지의 객체 헤더를 건드려 복사가 일어나지 않도록 고정
+    gc.collect()
+    gc.freeze()
+
+    print(
+        f"[serve] 사전 로드 완료 ({time.perf_counter() - start:.1f}s, "
+        f"벡터 인덱스 {len(vectors) if vectors is not None else 0}편, "
+        f"kNN 그래프 {len(related) if related is not None else 0}편, "
+        f"스냅샷 {index_bytes / 1e6:.1f}MB)"
+    )
+
+
+class Arbiter:
+    """워커 프로세스를 fork하고 감시하며 재시작/종료를 관리한다."""
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        workers: int,
+        graceful_timeout: float = 30.0,
+        log_level: str = "info",
+    ):
+        self.sock = sock
+        self.num_workers = workers
+        self.graceful_timeout = graceful_timeout
+        self.log_level = log_level
+        self.workers: dict[int, float] = {}  # pid -> 시작 시각
+        self.draining: set[int] = set()  # 종료 신호를 보냈지만 아직 회수되지 않은 워커
+        self.embedder: int | None = None  # 임베딩 서비스 프로세스 pid
+        self.signals: list[int] = []
+        self.stopping = False
+        # LLM 한도 배분용 살아 있는 워커 수 (fork 전에 만든 공유 메모리)
+        self.live_workers = multiprocessing.Value("i", 1, lock=False)
+
+    # ── 부모 프로세스 ──
+
+    def run(self):
+        for sig in (
+            signal.SIGHUP,
+            signal.SIGTERM,
+            signal.SIGINT,
+            signal.SIGTTIN,
+            signal.SIGTTOU,
+        ):
+            signal.signal(sig, lambda signum, frame: self.signals.append(signum))
+        # 워커가 자체 핸들러를 설치하기 전에 받은 SIGUSR1로 종료되지 않도록 상속 시 무시
+        signal.signal(signal.SIGUSR1, signal.SIG_IGN)
+
+        self.spawn_embedder()
+        self.manage_workers()
+        print(f"[serve] 마스터 {os.getpid()} 실행 중, 워커 {self.num_workers}개")
+
+        while not self.stopping:
+            while self.signals:
+                self.handle_signal(self.signals.pop(0))
+            if self.stopping:
+                break
+            self.reap_workers()
+            if self.embedder is None:
+                self.spawn_embedder()
+            self.manage_workers()
+            self.rebalance_llm_budget()
+            time.sleep(0.2)
+
+        self.stop()
+
+    def handle_signal(self, signum: int):
+        if signum in (signal.SIGTERM, signal.SIGINT):
+            self.stopping = True
+        elif signum == signal.SIGHUP:
+            self.reload()
+        elif signum == signal.SIGTTIN:
+            self.num_workers += 1
+            print(f"[serve] 워커 수 증가: {self.num_workers}")
+        elif signum == signal.SIGTTOU and self.num_workers > 1:
+            self.num_workers -= 1
+            print(f"[serve] 워커 수 감소: {self.num_workers}")
+
+    def reload(self):
+        """새 워커를 먼저 띄운 뒤 기존 워커를 graceful 종료한다 (무중단 재시작)."""
+        print("[serve] 워커 순차 재시작")
+        old_workers = list(self.workers)
+        for _ in range(self.num_workers):
+            self.spawn_worker()
+        for pid in old_workers:
+            self.kill_worker(pid, signal.SIGTERM)
+
+    def manage_workers(self):
+        while len(self.workers) < self.num_workers:
+            self.spawn_worker()
+        # 초과 워커는 가장 오래된 것부터 종료
+        excess = sorted(self.workers, key=self.workers.get)
+        for pid in excess[: max(0, len(self.workers) - self.num_workers)]:
+            self.kill_worker(pid, signal.SIGTERM)
+
+    def reap_workers(self):
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            self.draining.discard(pid)
+            if pid == self.embedder:
+                self.embedder = None
+                if not self.stopping:
+                    print(f"[serve] 임베딩 서비스 {pid} 종료 (status={status}), 재생성")
+                continue
+            if self.workers.pop(pid, None) is not None and not self.stopping:
+                print(f"[serve] 워커 {pid} 종료 (status={status}), 재생성")
+
+    def kill_worker(self, pid: int, sig: int):
+        if self.workers.pop(pid, None) is not None:
+            self.draining.add(pid)
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            self.draining.discard(pid)
+
+    def rebalance_llm_budget(self):
+        """살아 있는 워커 수가 바뀌면 모든 워커의 LLM 한도를 다시 배분한다."""
+        live = max(1, len(self.workers) + len(self.draining))
+        if live == self.live_workers.value:
+            return
+        self.live_workers.value = live
+        for pid in [*self.workers, *self.draining]:
+            try:
+                os.kill(pid, signal.SIGUSR1)
+            except ProcessLookupError:
+                pass
+
+    def stop(self):
+        print("[serve] 종료 중...")
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.workers.pop(pid, None)
+
+        self.draining.update(self.workers)
+        self.workers.clear()
+
+        deadline = time.monotonic() + self.graceful_timeout
+        while self.draining and time.monotonic() < deadline:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == self.embedder:
+                self.embedder = None
+            elif pid:
+                self.draining.discard(pid)
+            else:
+                time.sleep(0.1)
+
+        for pid in list(self.draining):
+            self.kill_worker(pid, signal.SIGKILL)
+
+        # 워커가 모두 끝난 뒤 임베딩 서비스를 종료한다
+        if self.embedder is not None:
+            try:
+                os.kill(self.embedder, signal.SIGTERM)
+                os.waitpid(self.embedder, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+            self.embedder = None
+        self.sock.close()
+
+    def spawn_embedder(self):
+        """임베딩 모델을 한 번만 로드하는 임베딩 서비스 프로세스를 띄운다."""
+        from src.embedding_service import AUTHKEY_ENV, SOCKET_ENV, serve_embeddings
+
+        pid = os.fork()
+        if pid:
+            self.embedder = pid
+            return
+
+        exit_code = 0
+        try:
+            for sig in (signal.SIGHUP, signal.SIGTTIN, signal.SIGTTOU, signal.SIGUSR1):
+                signal.signal(sig, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            self.sock.close()
+            serve_embeddings(
+                os.environ[SOCKET_ENV], bytes.fromhex(os.environ[AUTHKEY_ENV])
+            )
+        except BaseException as e:  # noqa: BLE001
+            print(f"[serve] 임베딩 서비스 {os.getpid()} 오류: {e!r}", file=sys.stderr)
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(exit_code)
+
+    def spawn_worker(self):
+        pid = os.fork()
+        if pid:
+            self.workers[pid] = time.monotonic()
+            return
+
+        # ── 워커 프로세스 ──
+        exit_code = 0
+        try:
+            self.run_worker()
+        except BaseException as e:  # noqa: BLE001
+            print(f"[serve] 워커 {os.getpid()} 오류: {e!r}", file=sys.stderr)
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(exit_code)
+
+    # ── 워커 프로세스 ──
+
+    def run_worker(self):
+        import random
+
+        import uvicorn
+
+        from src.app import app
+        from src.nodes import dispatcher
+
+        for sig in (signal.SIGHUP, signal.SIGTTIN, signal.SIGTTOU):
+            signal.signal(sig, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        random.seed()
+
+        # LLM 레이트 리밋은 계정 단위이므로 살아 있는 워커 수로 나누어 배분.
+        # 부모가 워커 수를 바꾸면 SIGUSR1로 알려주므로 핸들러를 먼저 설치한 뒤 적용한다.
+        limits = dispatcher.stats()
+
+        def apply_llm_budget(*_):
+            workers = max(1, self.live_workers.value)
+            dispatcher.configure(
+                rpm=max(1, limits["rpm_limit"] // workers),
+                tpm=max(1, limits["tpm_limit"] // workers),
+            )
+
+        signal.signal(signal.SIGUSR1, apply_llm_budget)
+        apply_llm_budget()
+
+        config = uvicorn.Config(
+            app,
+            log_level=self.log_level,
+            timeout_graceful_shutdown=int(self.graceful_timeout),
+        )
+        server = uvicorn.Server(config)
+        server.run(sockets=[self.sock])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="arXiv RAG 운영 서버 (pre-fork)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        help="워커 프로세스 수 (기본: WEB_CONCURRENCY 또는 CPU 코어 수)",
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=float,
+        default=30.0,
+        help="종료/재시작 시 진행 중인 요청을 기다리는 최대 시간(초)",
+    )
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    # 워커가 상속하는 임베딩 서비스 주소/인증 키 (소켓은 소유자 전용 디렉터리에 만든다)
+    from src.embedding_service import AUTHKEY_ENV, SOCKET_ENV
+
+    runtime_dir = Path(tempfile.mkdtemp(prefix="arxiv-rag-"))
+    os.environ[SOCKET_ENV] = str(runtime_dir / "embedding.sock")
+    os.environ[AUTHKEY_ENV] = os.urandom(32).hex()
+
+    preload()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((args.host, args.port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    print(f"[serve] http://{args.host}:{args.port} 에서 수신 대기")
+
+    try:
+        Arbiter(
+            sock,
+            workers=max(1, args.workers),
+            graceful_timeout=args.graceful_timeout,
+            log_level=args.log_level,
+        ).run()
+    finally:
+        shutil.rmtree(runtime_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,48 @@
 """LangGraph 상태 정의 모듈."""
 
-from typing import Any
+import operator
+from dataclasses import dataclass
+from typing import Annotated, Any
 
-from langgraph.graph import MessagesState
 from typing_extensions import TypedDict
 
 
+@dataclass(frozen=True, slots=True)
+class DocRef:
+    """검색된 문서에 대한 경량 참조.
+
+    본문과 메타데이터는 상태에 싣지 않고, 필요한 노드에서 id로 벡터 DB에서
+    불러온다 (`src.nodes.hydrate_documents`).
+
+    Attributes:
+        id: 문서 id (arXiv entry id).
+        distance: 질의와의 벡터 거리.
+    """
+
+    id: str
+    distance: float | None = None
+
+
 class AgentState(TypedDict):
     """RAG 에이전트의 상태를 정의한다.
 
+    노드는 전체 상태가 아닌 변경된 키만 반환하며, steps는 append 리듀서로 누적된다.
+
     Attributes:
         question: 사용자의 질문.
-        documents: 검색된 문서 리스트.
+        documents: 검색된 문서 참조 리스트.
         filters: 추출된 필터 조건 (연도 등).
         generation: 최종 생성된 답변.
         steps: 워크플로우 진행 단계 기록.
         route: 라우팅 결과 ('retrieve' 또는 'chat').
+        degrade_level: 부하 단계 (0: 전체, 1: 재순위화 생략, 2: 컨텍스트 축소,
+            3: 검색 결과만 반환).
     """
 
     question: str
-    documents: list[dict[str, Any]]
+    documents: list[DocRef]
     filters: dict[str, Any]
     generation: str
-    steps: list[str]
+    steps: Annotated[list[str], operator.add]
     route: str
+    degrade_level: int
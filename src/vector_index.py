@@ -0,0 +1,176 @@
+"""mmap 벡터 인덱스 모듈.
+
+스냅샷마다 정규화된 문서 임베딩 행렬(`vectors.npy`)과 필터용 메타데이터
+(`vector_meta.npz`)를 저장하고, 서버는 행렬을 `np.load(mmap_mode="r")`로 열어
+정확한(brute-force) 코사인 검색을 수행한다. 행렬은 파일 매핑이므로 같은 스냅샷을 여는
+모든 워커 프로세스가 OS 페이지 캐시의 한 사본을 공유하며, 워커마다 HNSW 인덱스를
+메모리에 올리지 않는다. ChromaDB는 본문/메타데이터 조회(SQLite)에만 사용한다.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.index_versions import current_index_dir
+from src.related import _normalize
+
+VECTORS_FILENAME = "vectors.npy"
+VECTOR_META_FILENAME = "vector_meta.npz"
+
+
+class VectorIndex:
+    """스냅샷 문서 임베딩 행렬과 필터용 메타데이터.
+
+    Attributes:
+        ids: 행 번호 -> 문서 id.
+        vectors: (n, dim) 정규화된 임베딩 (load 시 읽기 전용 mmap).
+        years: 행 번호 -> 발행 연도 (없으면 0).
+        categories: 행 번호 -> ",cs.cl,cs.ai," 형식의 소문자 카테고리 목록.
+        authors: 행 번호 -> 소문자 저자 목록 문자열.
+    """
+
+    __slots__ = ("ids", "vectors", "years", "categories", "authors")
+
+    def __init__(self, ids, vectors, years, categories, authors):
+        self.ids = np.asarray(ids, dtype=object)
+        self.vectors = vectors
+        self.years = np.asarray(years, dtype=np.int32)
+        self.categories = np.asarray(categories, dtype=str)
+        self.authors = np.asarray(authors, dtype=str)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_metadatas(
+        cls,
+        ids: list[str],
+        embeddings: np.ndarray,
+        metadatas: list[dict],
+    ) -> "VectorIndex":
+        """ChromaDB에서 읽은 임베딩/메타데이터로 인덱스를 만든다."""
+        categories = []
+        for meta in metadatas:
+            terms = [c.strip().lower() for c in (meta or {}).get("categories", "").split(",")]
+            categories.append("," + ",".join(t for t in terms if t) + ",")
+        return cls(
+            ids,
+            _normalize(embeddings),
+            [int((meta or {}).get("year") or 0) for meta in metadatas],
+            categories,
+            [(meta or {}).get("authors", "").lower() for meta in metadatas],
+        )
+
+    def save(self, directory: Path):
+        vectors_path = directory / VECTORS_FILENAME
+        meta_path = directory / VECTOR_META_FILENAME
+        tmp_vectors = vectors_path.with_suffix(f".{os.getpid()}.tmp.npy")
+        tmp_meta = meta_path.with_suffix(f".{os.getpid()}.tmp.npz")
+        np.save(tmp_vectors, np.ascontiguousarray(self.vectors, dtype=np.float32))
+        np.savez(
+            tmp_meta,
+            ids=self.ids.astype(str),
+            years=self.years,
+            categories=self.categories,
+            authors=self.authors,
+        )
+        # vectors.npy를 마지막에 교체하여 새로 만드는 중에는 exists()가 False가 되게 한다
+        tmp_meta.replace(meta_path)
+        tmp_vectors.replace(vectors_path)
+
+    @classmethod
+    def load(cls, directory: Path) -> "VectorIndex":
+        with np.load(directory / VECTOR_META_FILENAME) as meta:
+            ids, years = meta["ids"].tolist(), meta["years"]
+            categories, authors = meta["categories"], meta["authors"]
+        vectors = np.load(directory / VECTORS_FILENAME, mmap_mode="r")
+        return cls(ids, vectors, years, categories, authors)
+
+    @staticmethod
+    def exists(directory: Path) -> bool:
+        return (directory / VECTORS_FILENAME).exists() and (
+            directory / VECTOR_META_FILENAME
+        ).exists()
+
+    def filter_mask(
+        self,
+        year_from: int | None = None,
+        year_to: int | None = None,
+        category: str | None = None,
+        author: str | None = None,
+    ) -> np.ndarray | None:
+        """조건을 만족하는 행의 불리언 마스크 (조건이 없으면 None)."""
+        mask = None
+
+        def narrow(condition: np.ndarray):
+            nonlocal mask
+            mask = condition if mask is None else mask & condition
+
+        if year_from is not None:
+            narrow(self.years >= year_from)
+        if year_to is not None:
+            narrow(self.years <= year_to)
+        if category:
+            narrow(np.char.find(self.categories, f",{category.strip().lower()},") >= 0)
+        if author:
+            narrow(np.char.find(self.authors, author.strip().lower()) >= 0)
+        return mask
+
+    def search(
+        self,
+        queries: np.ndarray,
+        n_results: int,
+        mask: np.ndarray | None = None,
+    ) -> tuple[list[list[str]], list[list[float]]]:
+        """질의별 상위 n_results개 (id, 코사인 거리) 목록을 반환한다.
+
+        결과 형식은 ChromaDB query의 ids/distances와 같다 (거리 = 1 - 코사인 유사도).
+        """
+        queries = _normalize(np.atleast_2d(queries))
+        candidates = np.arange(len(self)) if mask is None else np.flatnonzero(mask)
+        k = min(n_results, len(candidates))
+        if k <= 0:
+            return [[] for _ in queries], [[] for _ in queries]
+
+        corpus = self.vectors if mask is None else self.vectors[candidates]
+        sims = queries @ corpus.T
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        top_sims = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_sims, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_sims = np.take_along_axis(top_sims, order, axis=1)
+
+        ids = [self.ids[candidates[row]].tolist() for row in top]
+        distances = [(1.0 - row).tolist() for row in top_sims]
+        return ids, distances
+
+
+_index_lock = threading.Lock()
+_index_cache: dict = {"version": None, "index": None, "checked": 0.0}
+INDEX_RELOAD_INTERVAL = float(os.getenv("INDEX_RELOAD_INTERVAL", "1.0"))
+
+
+def get_vector_index() -> VectorIndex | None:
+    """현재 서비스 중인 인덱스 버전의 벡터 인덱스를 반환한다 (없으면 None).
+
+    인덱스 버전이 바뀌면 해당 스냅샷의 파일을 새로 매핑한다.
+    """
+    now = time.monotonic()
+    with _index_lock:
+        if now - _index_cache["checked"] < INDEX_RELOAD_INTERVAL:
+            return _index_cache["index"]
+        _index_cache["checked"] = now
+
+        version, path = current_index_dir()
+        if version != _index_cache["version"] or _index_cache["index"] is None:
+            index = VectorIndex.load(path) if VectorIndex.exists(path) else None
+            if index is None and version != _index_cache["version"]:
+                print(
+                    f"벡터 인덱스 없음 ({path}): ChromaDB HNSW로 검색합니다. "
+                    "`python -m src.ingestion --build-vectors`로 생성할 수 있습니다."
+                )
+            _index_cache.update(version=version, index=index)
+        return _index_cache["index"]
@@ -0,0 +1,4 @@
+import os
+
+# src.nodes는 import 시 LLM 백엔드를 만들므로 네트워크/API 키 없이 스텁을 사용한다
+os.environ.setdefault("LLM_BACKEND", "stub")
@@ -0,0 +1,132 @@
+"""AdmissionController의 거절, 단계 상승, 부하 감소 후 회복을 확인한다."""
+
+from src.admission import (
+    DEGRADE_NONE,
+    DEGRADE_RETRIEVAL_ONLY,
+    DEGRADE_SHORT_CONTEXT,
+    DEGRADE_SKIP_RERANK,
+    AdmissionController,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _controller(clock: FakeClock, **kwargs) -> AdmissionController:
+    options = {
+        "thresholds": [8, 16, 24],
+        "max_in_flight": 32,
+        "latency_target": 20.0,
+        "stale_after": 60.0,
+        "probe_interval": 10.0,
+    }
+    options.update(kwargs)
+    return AdmissionController(clock=clock, **options)
+
+
+def _record_pipeline(controller, level, generate, rerank=0.5, retrieve=0.2):
+    controller.record_node("router", 0.3, level)
+    controller.record_node("retrieve", retrieve, level)
+    controller.record_node("rerank", rerank, level)
+    controller.record_node("generate", generate, level)
+
+
+def test_rejects_at_max_in_flight_and_admits_after_release():
+    controller = _controller(FakeClock(), thresholds=[], max_in_flight=2)
+
+    assert controller.admit() == DEGRADE_NONE
+    assert controller.admit() == DEGRADE_NONE
+    assert controller.admit() is None
+    assert controller.stats()["rejected"] == 1
+    assert controller.retry_after() == 1
+
+    controller.release(3.2)
+    assert controller.admit() == DEGRADE_NONE
+    assert controller.retry_after() == 4
+
+
+def test_load_thresholds_step_down_one_level_each():
+    controller = _controller(FakeClock(), thresholds=[1, 2, 3], max_in_flight=10)
+
+    levels = [controller.admit() for _ in range(5)]
+
+    assert levels == [0, 1, 2, 3, 3]
+
+
+def test_slow_nodes_escalate_only_while_requests_are_in_flight():
+    clock = FakeClock()
+    controller = _controller(clock)
+    _record_pipeline(controller, DEGRADE_NONE, generate=25.0)
+
+    # 처리 중인 요청이 없으면 느린 추정치만으로 낮추지 않는다
+    assert controller.admit() == DEGRADE_NONE
+    # 처리 중인 요청이 있으면 예상 시간이 목표 이하가 되는 단계까지 낮춘다
+    # (축소 생성은 아직 관측되지 않아 전체 생성 시간으로 추정 -> 검색 결과만)
+    assert controller.admit() == DEGRADE_RETRIEVAL_ONLY
+
+    controller.record_node("generate", 6.0, DEGRADE_SHORT_CONTEXT)
+    controller.record_node("rerank", 0.01, DEGRADE_SHORT_CONTEXT)
+    assert controller.admit() == DEGRADE_SHORT_CONTEXT
+
+
+def test_skipping_rerank_is_enough_when_rerank_is_the_slow_node():
+    controller = _controller(FakeClock())
+    _record_pipeline(controller, DEGRADE_NONE, generate=8.0, rerank=15.0)
+    controller.record_node("rerank", 0.01, DEGRADE_SKIP_RERANK)
+    controller.admit()
+
+    assert controller.admit() == DEGRADE_SKIP_RERANK
+    assert controller.stats()["predicted_latency_ms"]["no_rerank"] < 20_000
+
+
+def test_one_slow_call_does_not_pin_idle_traffic_to_retrieval_only():
+    clock = FakeClock()
+    controller = _controller(clock)
+    _record_pipeline(controller, DEGRADE_NONE, generate=22.0)
+
+    levels = []
+    for _ in range(200):
+        level = controller.admit()
+        levels.append(level)
+        clock.now += 0.5
+        _record_pipeline(controller, level, generate=1.0)
+        controller.release(2.0)
+
+    assert set(levels) == {DEGRADE_NONE}
+    assert controller.stats()["predicted_latency_ms"]["full"] < 20_000
+
+
+def test_probe_requests_refresh_full_estimates_under_load():
+    clock = FakeClock()
+    controller = _controller(clock)
+    _record_pipeline(controller, DEGRADE_NONE, generate=22.0)
+    controller.record_node("generate", 0.1, DEGRADE_RETRIEVAL_ONLY)
+    controller.admit()  # 계속 처리 중인 요청 하나
+
+    clock.now += 10.0
+    # 탐색 요청은 부하 단계 그대로 실행되고, 다음 간격까지는 낮춘 단계로 처리된다
+    assert controller.admit() == DEGRADE_NONE
+    assert controller.admit() == DEGRADE_RETRIEVAL_ONLY
+    assert controller.stats()["probes"] == 1
+
+    # 탐색 요청이 빨라진 생성 시간을 기록하면 전체 단계로 돌아온다
+    _record_pipeline(controller, DEGRADE_NONE, generate=1.0)
+    assert controller.admit() == DEGRADE_NONE
+
+
+def test_stale_estimates_expire():
+    clock = FakeClock()
+    controller = _controller(clock, probe_interval=1e9)
+    _record_pipeline(controller, DEGRADE_NONE, generate=22.0)
+    controller.admit()
+    clock.now += 1.0
+    assert controller.admit() == DEGRADE_RETRIEVAL_ONLY
+
+    clock.now += 61.0
+    assert controller.admit() == DEGRADE_NONE
+    assert controller.stats()["node_latency_ms"] == {}
@@ -0,0 +1,111 @@
+"""LLMDispatcher의 우선순위, RPM/TPM 대기, 재시도를 스텁 백엔드로 확인한다."""
+
+import threading
+import time
+
+import pytest
+
+from src.nodes import (
+    PRIORITY_GENERATION,
+    PRIORITY_INTERACTIVE,
+    LLMDispatcher,
+    StubChatModel,
+    estimate_tokens,
+)
+
+
+def _prompt(tokens: int) -> str:
+    """estimate_tokens 기준으로 정확히 tokens개가 되는 프롬프트."""
+    prompt = "x" * (2 * (tokens - 1))
+    assert estimate_tokens(prompt) == tokens
+    return prompt
+
+
+def _wait_for_queue(dispatcher: LLMDispatcher, depth: int, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while dispatcher.stats()["queue_depth"] < depth:
+        assert time.monotonic() < deadline, "대기열에 들어가지 않았습니다"
+        time.sleep(0.005)
+
+
+def test_interactive_calls_overtake_waiting_generation_calls():
+    order: list[str] = []
+    backend = StubChatModel(responder=lambda prompt: order.append(prompt) or "ok")
+    rpm = 240  # 0.25초마다 1건
+    dispatcher = LLMDispatcher(backend, rpm=rpm, tpm=1_000_000)
+    for _ in range(rpm):
+        dispatcher.invoke("warmup", expected_output_tokens=0)
+    order.clear()
+
+    threads = []
+    calls = [
+        ("gen-1", PRIORITY_GENERATION),
+        ("gen-2", PRIORITY_GENERATION),
+        ("chat-1", PRIORITY_INTERACTIVE),
+        ("chat-2", PRIORITY_INTERACTIVE),
+    ]
+    for depth, (prompt, priority) in enumerate(calls, start=1):
+        thread = threading.Thread(
+            target=dispatcher.invoke,
+            args=(prompt,),
+            kwargs={"priority": priority, "expected_output_tokens": 0},
+        )
+        thread.start()
+        threads.append(thread)
+        _wait_for_queue(dispatcher, depth)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert order == ["chat-1", "chat-2", "gen-1", "gen-2"]
+
+
+def test_waits_for_rpm_budget():
+    rpm = 120  # 0.5초마다 1건
+    dispatcher = LLMDispatcher(StubChatModel(), rpm=rpm, tpm=1_000_000)
+    start = time.monotonic()
+    for _ in range(rpm):
+        dispatcher.invoke("hi", expected_output_tokens=0)
+    assert time.monotonic() - start < 0.2
+
+    start = time.monotonic()
+    dispatcher.invoke("hi", expected_output_tokens=0)
+    assert time.monotonic() - start >= 0.4
+
+
+def test_waits_for_tpm_budget_and_settles_actual_usage():
+    tpm = 1200  # 초당 20토큰
+    dispatcher = LLMDispatcher(StubChatModel(reply=""), rpm=10_000, tpm=tpm)
+
+    # 추정 1190토큰, 실제 사용량은 응답 1토큰이 더해져 1191토큰으로 정산된다
+    dispatcher.invoke(_prompt(1190), expected_output_tokens=0)
+    assert dispatcher.stats()["tokens_available"] == pytest.approx(9, abs=1)
+
+    # 19토큰 요청은 약 10토큰(0.5초)이 보충될 때까지 기다린다
+    start = time.monotonic()
+    dispatcher.invoke(_prompt(19), expected_output_tokens=0)
+    assert time.monotonic() - start >= 0.3
+
+
+def test_retries_connection_errors():
+    backend = StubChatModel(reply="retrieve", failures=2)
+    dispatcher = LLMDispatcher(backend, max_retries=3, backoff=0.01)
+
+    response = dispatcher.invoke("route this")
+
+    assert response.content == "retrieve"
+    assert backend.calls == 3
+    stats = dispatcher.stats()
+    assert stats["retries"] == 2
+    assert stats["completed"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_gives_up_after_max_retries():
+    backend = StubChatModel(failures=10)
+    dispatcher = LLMDispatcher(backend, max_retries=2, backoff=0.01)
+
+    with pytest.raises(ConnectionError):
+        dispatcher.invoke("route this")
+
+    assert backend.calls == 3
+    assert dispatcher.stats()["in_flight"] == 0
@@ -0,0 +1,62 @@
+"""관련 논문 kNN 그래프의 증분 계산이 전체 재계산과 같은지 확인한다."""
+
+import numpy as np
+import pytest
+
+from src.related import build_knn_graph
+
+
+def _papers(ids: list[str], rng: np.random.Generator) -> dict[str, np.ndarray]:
+    return {paper_id: rng.standard_normal(32).astype(np.float32) for paper_id in ids}
+
+
+def _build(papers: dict[str, np.ndarray], previous=None, k: int = 5):
+    ids = list(papers)
+    return build_knn_graph(
+        ids,
+        np.stack([papers[paper_id] for paper_id in ids]),
+        titles=[f"title {paper_id}" for paper_id in ids],
+        urls=[f"url {paper_id}" for paper_id in ids],
+        k=k,
+        previous=previous,
+    )
+
+
+def _assert_same_graph(actual, expected):
+    assert list(actual.ids) == list(expected.ids)
+    for paper_id in expected.ids:
+        got = actual.neighbors(paper_id)
+        want = expected.neighbors(paper_id)
+        assert [n["id"] for n in got] == [n["id"] for n in want]
+        assert [n["score"] for n in got] == pytest.approx([n["score"] for n in want])
+
+
+@pytest.mark.parametrize(
+    ("added", "removed"),
+    [
+        (50, 0),  # 추가만
+        (0, 30),  # 삭제만
+        (40, 30),  # 추가 + 삭제
+    ],
+)
+def test_incremental_matches_full_rebuild(added, removed):
+    rng = np.random.default_rng(added * 100 + removed)
+    old = _papers([f"p{i}" for i in range(300)], rng)
+    previous = _build(old)
+
+    # 순서를 섞어 기존 논문의 행 번호가 바뀌는 경우도 함께 확인
+    current = {paper_id: vec for paper_id, vec in old.items()}
+    for paper_id in rng.choice(list(old), removed, replace=False):
+        del current[paper_id]
+    current.update(_papers([f"n{i}" for i in range(added)], rng))
+    shuffled = {paper_id: current[paper_id] for paper_id in rng.permutation(list(current))}
+
+    _assert_same_graph(_build(shuffled, previous=previous), _build(shuffled))
+
+
+def test_falls_back_to_full_rebuild_when_k_changes():
+    rng = np.random.default_rng(0)
+    papers = _papers([f"p{i}" for i in range(100)], rng)
+    previous = _build(papers, k=3)
+
+    _assert_same_graph(_build(papers, previous=previous, k=5), _build(papers, k=5))
@@ -0,0 +1,111 @@
+"""/search의 필터 적용 페이지네이션과 커서 왕복을 확인한다."""
+
+import numpy as np
+import pytest
+
+import src.nodes
+import src.search
+from src.search import search_index
+from src.vector_index import VectorIndex
+
+NUM_PAPERS = 2000
+
+
+class FakeCollection:
+    """메타데이터 조회(get)만 지원하는 ChromaDB 컬렉션 대역."""
+
+    def __init__(self, metadatas: dict[str, dict]):
+        self.metadatas = metadatas
+
+    def get(self, ids, include):
+        return {"ids": list(ids), "metadatas": [self.metadatas[i] for i in ids]}
+
+
+@pytest.fixture
+def corpus(monkeypatch):
+    rng = np.random.default_rng(0)
+    ids = [f"p{i}" for i in range(NUM_PAPERS)]
+    embeddings = rng.standard_normal((NUM_PAPERS, 16)).astype(np.float32)
+    # 5%만 일치하는 저자
+    metadatas = [
+        {
+            "title": f"paper {i}",
+            "year": 2020 + i % 5,
+            "categories": "cs.CL" if i % 3 else "cs.LG, cs.CL",
+            "authors": "Rare Author" if i % 20 == 0 else f"Author {i % 50}",
+        }
+        for i in range(NUM_PAPERS)
+    ]
+    index = VectorIndex.from_metadatas(ids, embeddings, metadatas)
+    query = rng.standard_normal(16).astype(np.float32)
+
+    monkeypatch.setattr(src.nodes, "get_vector_index", lambda: index)
+    monkeypatch.setattr(src.search, "embed_query", lambda q: query)
+    monkeypatch.setattr(
+        src.search, "get_collection", lambda: FakeCollection(dict(zip(ids, metadatas)))
+    )
+
+    normalized = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    ranking = [ids[i] for i in np.argsort(-(normalized @ query), kind="stable")]
+    return ranking, dict(zip(ids, metadatas))
+
+
+def _paginate(limit: int, **filters) -> list[str]:
+    seen, offset, pages = [], 0, 0
+    while True:
+        hits, has_more, _ = search_index("q", limit=limit, offset=offset, **filters)
+        assert len(hits) == limit or not has_more
+        seen.extend(hit["id"] for hit in hits)
+        offset += limit
+        pages += 1
+        assert pages < 1000
+        if not has_more:
+            return seen
+
+
+def test_rare_author_filter_paginates_through_every_match(corpus):
+    ranking, metadatas = corpus
+    expected = [i for i in ranking if metadatas[i]["authors"] == "Rare Author"]
+    assert len(expected) == NUM_PAPERS // 20
+
+    assert _paginate(limit=10, author="rare author") == expected
+
+
+def test_combined_filters_keep_rank_order(corpus):
+    ranking, metadatas = corpus
+    expected = [
+        i
+        for i in ranking
+        if metadatas[i]["year"] >= 2023 and "cs.LG" in metadatas[i]["categories"]
+    ]
+
+    assert _paginate(limit=7, year_from=2023, category="cs.lg") == expected
+
+
+def test_hits_include_metadata_and_distance(corpus):
+    ranking, metadatas = corpus
+    hits, has_more, timings = search_index("q", limit=3)
+
+    assert [hit["id"] for hit in hits] == ranking[:3]
+    assert hits[0]["metadata"] == metadatas[ranking[0]]
+    assert hits[0]["distance"] <= hits[1]["distance"] <= hits[2]["distance"]
+    assert has_more
+    assert set(timings) == {"embed", "search", "metadata"}
+
+
+def test_cursor_round_trip_and_rejects_other_queries():
+    from fastapi import HTTPException
+
+    from src.app import _decode_cursor, _encode_cursor
+
+    cursor = _encode_cursor(40, fingerprint=1234)
+    assert "=" not in cursor
+    assert _decode_cursor(cursor, 1234) == 40
+
+    with pytest.raises(HTTPException) as excinfo:
+        _decode_cursor(cursor, 9999)
+    assert excinfo.value.status_code == 400
+
+    with pytest.raises(HTTPException) as excinfo:
+        _decode_cursor("not-a-cursor", 1234)
+    assert excinfo.value.status_code == 400
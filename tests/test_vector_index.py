@@ -0,0 +1,71 @@
+"""mmap 벡터 인덱스의 저장/로드, 검색, 필터를 확인한다."""
+
+import numpy as np
+
+from src.vector_index import VectorIndex
+
+
+def _index(n: int = 200, seed: int = 0) -> tuple[VectorIndex, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    embeddings = rng.standard_normal((n, 16)).astype(np.float32)
+    metadatas = [
+        {
+            "year": 2020 + i % 5,
+            "categories": "cs.CL, cs.AI" if i % 2 else "cs.LG",
+            "authors": f"Author {i % 7}, Jane Kim" if i % 3 == 0 else f"Author {i % 7}",
+        }
+        for i in range(n)
+    ]
+    return VectorIndex.from_metadatas([f"p{i}" for i in range(n)], embeddings, metadatas), embeddings
+
+
+def _brute_force(embeddings: np.ndarray, query: np.ndarray, rows: np.ndarray) -> list[str]:
+    normalized = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    sims = normalized[rows] @ (query / np.linalg.norm(query))
+    return [f"p{rows[i]}" for i in np.argsort(-sims, kind="stable")]
+
+
+def test_save_and_load_uses_readonly_mmap(tmp_path):
+    index, _ = _index()
+    index.save(tmp_path)
+    assert VectorIndex.exists(tmp_path)
+
+    loaded = VectorIndex.load(tmp_path)
+    assert isinstance(loaded.vectors, np.memmap)
+    assert not loaded.vectors.flags.writeable
+    assert loaded.ids.tolist() == index.ids.tolist()
+    np.testing.assert_allclose(loaded.vectors, index.vectors)
+
+
+def test_search_matches_brute_force_and_reports_cosine_distance(tmp_path):
+    index, embeddings = _index()
+    index.save(tmp_path)
+    index = VectorIndex.load(tmp_path)
+    queries = np.random.default_rng(1).standard_normal((2, 16)).astype(np.float32)
+
+    ids, distances = index.search(queries, 10)
+
+    for query, query_ids, query_distances in zip(queries, ids, distances):
+        assert query_ids == _brute_force(embeddings, query, np.arange(len(index)))[:10]
+        assert query_distances == sorted(query_distances)
+        assert all(0.0 <= d <= 2.0 for d in query_distances)
+
+
+def test_filters_are_applied_before_ranking():
+    index, embeddings = _index()
+    query = np.random.default_rng(2).standard_normal(16).astype(np.float32)
+
+    mask = index.filter_mask(year_from=2021, year_to=2022, category="CS.cl", author="kim")
+    rows = np.array(
+        [i for i in range(len(index)) if i % 2 and i % 3 == 0 and 2021 <= 2020 + i % 5 <= 2022]
+    )
+    assert np.flatnonzero(mask).tolist() == rows.tolist()
+
+    ids, _ = index.search(query, 100, mask)
+    assert ids[0] == _brute_force(embeddings, query, rows)
+
+
+def test_category_filter_matches_whole_terms_only():
+    index, _ = _index()
+    assert index.filter_mask(category="cs").sum() == 0
+    assert index.filter_mask() is None